@@ -9,6 +9,8 @@ import platform
 import site
 import subprocess
 import sys
+import sysconfig
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 
 
@@ -21,8 +23,39 @@ def get_scripts_dir():
         return Path(os.path.expanduser("~/.local/bin"))
 
 
-def create_symlinks():
-    """Create symlinks to the contextr entry points."""
+def find_entry_point(name):
+    """Locate an installed console script without walking sys.prefix.
+
+    Checks the interpreter's scripts directory, then the user-scheme one
+    (used by ``pip install --user``).
+    """
+    if platform.system() == "Windows":
+        name += ".exe"
+    for scheme in (
+        sysconfig.get_default_scheme(),
+        sysconfig.get_preferred_scheme("user"),
+    ):
+        candidate = Path(sysconfig.get_path("scripts", scheme)) / name
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def is_installed():
+    """Check whether the contextr distribution is already installed."""
+    try:
+        version("contextr")
+        return True
+    except PackageNotFoundError:
+        return False
+
+
+def create_symlinks(force=False):
+    """Create symlinks to the contextr entry points.
+
+    The development install is skipped when contextr is already installed,
+    unless force is set (``python install.py --force``).
+    """
     venv_dir = Path(__file__).resolve().parent
 
     # Make sure we're in a contextr directory
@@ -30,8 +63,9 @@ def create_symlinks():
         print("Error: This script must be run from the contextr root directory.")
         return False
 
-    # First, install in development mode if not already
-    subprocess.run([sys.executable, "-m", "pip", "install", "-e", "."])
+    # First, install in development mode if not already (pip is slow to start)
+    if force or not is_installed():
+        subprocess.run([sys.executable, "-m", "pip", "install", "-e", "."])
 
     scripts_dir = get_scripts_dir()
     scripts_dir.mkdir(parents=True, exist_ok=True)
@@ -41,8 +75,8 @@ def create_symlinks():
     # Find entry points created by the install
     if system == "Windows":
         # For Windows, we need to look for the .exe files
-        source_ctxr = next(Path(sys.prefix).rglob("Scripts/ctxr.exe"), None)
-        source_contextr = next(Path(sys.prefix).rglob("Scripts/contextr.exe"), None)
+        source_ctxr = find_entry_point("ctxr")
+        source_contextr = find_entry_point("contextr")
 
         # Create .bat files in a PATH location
         if source_ctxr:
@@ -54,8 +88,8 @@ def create_symlinks():
                 f.write(f'@echo off\n"{source_contextr}" %*')
     else:
         # For Unix, create symlinks to the Python scripts
-        source_ctxr = next(Path(sys.prefix).rglob("bin/ctxr"), None)
-        source_contextr = next(Path(sys.prefix).rglob("bin/contextr"), None)
+        source_ctxr = find_entry_point("ctxr")
+        source_contextr = find_entry_point("contextr")
 
         if source_ctxr:
             target_ctxr = scripts_dir / "ctxr"
@@ -109,7 +143,7 @@ def main():
     """Main installation function."""
     print("Installing contextr...")
 
-    if create_symlinks():
+    if create_symlinks(force="--force" in sys.argv[1:]):
         scripts_dir = get_scripts_dir()
         print(f"\nSuccess! contextr commands installed to: {scripts_dir}")
 
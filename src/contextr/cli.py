@@ -1,23 +1,80 @@
 #!/usr/bin/env python3
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import cache
 from pathlib import Path
 from typing import List, Optional
 
-import pyperclip
 import typer
 from rich.console import Console
-from rich.table import Table
+from rich.markup import escape
+from rich.tree import Tree
 
 from . import __version__ as VERSION
-from .formatters import format_export_content, get_file_tree
+from .formatters import format_export_content, get_file_tree, write_export_content
 from .manager import ContextManager
 from .profile import ProfileManager, ProfileNotFoundError
+from .utils.clipboard import copy_to_clipboard
 
 app = typer.Typer(help="ctxr - Share your codebase with Large Language Models")
 console = Console()
 
-# Global context manager instance
-context_manager = ContextManager()
+
+@cache
+def get_context_manager() -> ContextManager:
+    """
+    Return the context manager for the current directory, created on first use.
+
+    Commands that never touch context state (e.g. version) skip loading
+    .contextr state and ignore rules entirely.
+    """
+    return ContextManager()
+
+
+# Files shown per directory by 'ctxr list' unless --full is given
+LIST_MAX_PER_DIR = 50
+
+
+def context_tree(
+    context_manager: ContextManager, max_per_dir: Optional[int] = None
+) -> Tree:
+    """Render the context file tree using the manager's cached relative paths."""
+    return get_file_tree(
+        context_manager.files,
+        context_manager.base_dir,
+        context_manager.relative_paths(),
+        max_per_dir=max_per_dir,
+    )
+
+
+# Exports larger than this are copied on a background thread
+BACKGROUND_COPY_MIN = 64_000
+
+
+def start_clipboard_copy(text: str) -> Future[None]:
+    """Copy text to the clipboard on a worker thread; result() waits for it."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    job = executor.submit(copy_to_clipboard, text)
+    # The worker is still joined at interpreter exit
+    executor.shutdown(wait=False)
+    return job
+
+
+def print_pattern_list(title: str, patterns: List[str]) -> None:
+    """Print a heading and one pattern per line (printed verbatim, no markup)."""
+    console.print(f"[bold green]{title}[/bold green]")
+    console.print("\n".join(patterns), markup=False, highlight=False)
+
+
+def print_context_summary(context_manager: ContextManager, show_tree: bool) -> None:
+    """Print the context tree if requested, otherwise just the file count."""
+    if show_tree:
+        console.print(context_tree(context_manager))
+    else:
+        console.print(
+            f"[dim]{len(context_manager.files)} files in context "
+            "(run 'ctxr list' to view them).[/dim]"
+        )
 
 
 @app.command()
@@ -25,12 +82,16 @@ def watch(
     patterns: List[str] = typer.Argument(
         ..., help="File patterns to watch (supports glob)"
     ),
+    show_tree: bool = typer.Option(
+        False, "--show-tree", help="Show the context file tree afterwards"
+    ),
 ) -> None:
     """
     Watch file patterns - matching files are automatically added to context.
 
     Example: ctxr watch "src/**/*.py" "*.md"
     """
+    context_manager = get_context_manager()
     new_patterns, added_files = context_manager.watch_paths(patterns)
 
     if new_patterns > 0:
@@ -47,12 +108,15 @@ def watch(
             "context.[/green]"
         )
 
-    console.print(get_file_tree(context_manager.files, context_manager.base_dir))
+    print_context_summary(context_manager, show_tree)
 
 
 @app.command()
 def ignore(
     patterns: List[str] = typer.Argument(..., help="Pattern(s) to add to .ignore"),
+    show_tree: bool = typer.Option(
+        False, "--show-tree", help="Show the context file tree afterwards"
+    ),
 ) -> None:
     """
     Add one or more patterns to the ignore list (.contextr/.ignore).
@@ -61,22 +125,17 @@ def ignore(
       ctxr ignore "**/*.log"
       ctxr ignore "**/__pycache__/**" "*.pyc" "node_modules/"
     """
+    context_manager = get_context_manager()
     removed_files, cleaned_dirs = context_manager.add_ignore_patterns(patterns)
     console.print(f"[green]Added {len(patterns)} pattern(s) to .ignore[/green]")
 
     if removed_files:
         console.print(
             f"[yellow]Removed {removed_files} existing files matching "
-            "pattern(s)[/yellow]"
-        )
-
-    if cleaned_dirs:
-        console.print(
-            f"[blue]Rescanned {cleaned_dirs} directories for new valid files[/blue]"
+            f"pattern(s) from {cleaned_dirs} directories[/yellow]"
         )
 
-    # Show the updated context
-    console.print(get_file_tree(context_manager.files, context_manager.base_dir))
+    print_context_summary(context_manager, show_tree)
 
 
 @app.command(name="ignore-list")
@@ -86,12 +145,10 @@ def ignore_list() -> None:
 
     Example: ctxr ignore-list
     """
+    context_manager = get_context_manager()
     patterns = context_manager.list_ignore_patterns()
     if patterns:
-        table = Table("Ignore Patterns", style="bold green")
-        for pattern in patterns:
-            table.add_row(pattern)
-        console.print(table)
+        print_pattern_list("Ignore Patterns", patterns)
     else:
         console.print("[yellow]No patterns in .ignore file[/yellow]")
 
@@ -116,6 +173,7 @@ def sync(
 
     Example: ctxr sync
     """
+    context_manager = get_context_manager()
     # Refresh files and get accurate added/removed stats
     stats = context_manager.refresh_watched()
     total_added = stats.get("added", 0)
@@ -141,14 +199,38 @@ def sync(
         console.print("[red]No files in context to export![/red]")
         return
 
+    if to_file and no_clipboard:
+        # Only the file needs the export: stream it there instead of building
+        # the whole text in memory first
+        try:
+            with open(to_file, "w", encoding="utf-8") as out:
+                write_export_content(
+                    out,
+                    context_manager.files,
+                    context_manager.base_dir,
+                    relative=not absolute,
+                    include_contents=not no_contents,
+                    rel_paths=context_manager.relative_paths(),
+                )
+            console.print(f"[green]Saved export to {to_file}[/green]")
+        except Exception as e:
+            console.print(f"[red]File write error:[/red] {e}")
+        return
+
     # Format and export the content
     output_text = format_export_content(
         context_manager.files,
         context_manager.base_dir,
         relative=not absolute,
         include_contents=not no_contents,
+        rel_paths=context_manager.relative_paths(),
     )
 
+    # Large payloads are piped to the clipboard tool while the file is written
+    copy_job: Optional[Future[None]] = None
+    if not no_clipboard and to_file and len(output_text) > BACKGROUND_COPY_MIN:
+        copy_job = start_clipboard_copy(output_text)
+
     # Write to file if requested
     wrote_file = False
     if to_file:
@@ -162,7 +244,10 @@ def sync(
     # Copy to clipboard unless disabled
     if not no_clipboard:
         try:
-            pyperclip.copy(output_text)
+            if copy_job is None:
+                copy_to_clipboard(output_text)
+            else:
+                copy_job.result()
             console.print(
                 f"[green]Exported {len(context_manager.files)} files to "
                 "clipboard![/green]"
@@ -178,13 +263,20 @@ def sync(
 
 
 @app.command(name="list")
-def list_command() -> None:
+def list_command(
+    full: bool = typer.Option(
+        False,
+        "--full",
+        help=f"Show every file (default: at most {LIST_MAX_PER_DIR} per directory)",
+    ),
+) -> None:
     """
     List all files in the current context.
 
     Example: ctxr list
     """
-    console.print(get_file_tree(context_manager.files, context_manager.base_dir))
+    context_manager = get_context_manager()
+    console.print(context_tree(context_manager, None if full else LIST_MAX_PER_DIR))
 
 
 @app.command(name="watch-list")
@@ -194,12 +286,10 @@ def watch_list() -> None:
 
     Example: ctxr watch-list
     """
+    context_manager = get_context_manager()
     patterns = context_manager.list_watched()
     if patterns:
-        table = Table("Watched Patterns", style="bold green")
-        for pattern in patterns:
-            table.add_row(pattern)
-        console.print(table)
+        print_pattern_list("Watched Patterns", patterns)
     else:
         console.print("[yellow]No patterns are currently being watched[/yellow]")
 
@@ -213,6 +303,7 @@ def unwatch(
 
     Example: ctxr unwatch "src/tests/**"
     """
+    context_manager = get_context_manager()
     removed_patterns, removed_files = context_manager.unwatch_paths(patterns)
 
     if removed_patterns > 0:
@@ -231,6 +322,9 @@ def unwatch(
 @app.command(name="unignore")
 def unignore(
     patterns: List[str] = typer.Argument(..., help="Pattern(s) to remove from ignore"),
+    show_tree: bool = typer.Option(
+        False, "--show-tree", help="Show the context file tree afterwards"
+    ),
 ) -> None:
     """
     Remove one or more patterns from ignore list.
@@ -239,6 +333,7 @@ def unignore(
       ctxr unignore "**/*.log"
       ctxr unignore "node_modules/" "*.pyc"
     """
+    context_manager = get_context_manager()
     removed = context_manager.remove_ignore_patterns(patterns)
     if removed:
         console.print(f"[green]Removed {removed} pattern(s) from .ignore[/green]")
@@ -248,9 +343,7 @@ def unignore(
                 f"[blue]Context updated: +{stats['added']} / -{stats['removed']}[/blue]"
             )
         if context_manager.files:
-            console.print(
-                get_file_tree(context_manager.files, context_manager.base_dir)
-            )
+            print_context_summary(context_manager, show_tree)
     else:
         console.print("[yellow]No matching patterns found in .ignore[/yellow]")
 
@@ -262,6 +355,7 @@ def gis() -> None:
 
     Example: ctxr gis
     """
+    context_manager = get_context_manager()
     if not (context_manager.base_dir / ".gitignore").exists():
         console.print("[red]No .gitignore file found in current directory![/red]")
         return
@@ -274,7 +368,7 @@ def gis() -> None:
         )
         # List patterns without table for better readability
         for pattern in new_patterns[:10]:  # Show first 10
-            console.print(f"  [green]+[/green] {pattern}")
+            console.print(f"  [green]+[/green] {escape(pattern)}")
         if len(new_patterns) > 10:
             console.print(
                 f"  [dim]... and {len(new_patterns) - 10} more patterns[/dim]"
@@ -309,6 +403,7 @@ def init() -> None:
 
     Example: ctxr init
     """
+    context_manager = get_context_manager()
     created_dir, _ = context_manager.initialize()
 
     if created_dir:
@@ -336,6 +431,7 @@ def status() -> None:
 
     Example: ctxr status
     """
+    context_manager = get_context_manager()
     # Show current profile and dirty state
     profile_info = "None"
     if context_manager.current_profile_name:
@@ -390,6 +486,7 @@ def profile_save(
 
     Example: ctxr profile save frontend --description "Frontend development context"
     """
+    context_manager = get_context_manager()
     # Use current profile name if no name provided
     if name is None:
         if context_manager.current_profile_name:
@@ -443,6 +540,7 @@ def profile_list() -> None:
 
     Example: ctxr profile list
     """
+    context_manager = get_context_manager()
     # Create ProfileManager instance
     profile_manager = ProfileManager(context_manager.storage, context_manager.base_dir)
 
@@ -481,6 +579,7 @@ def profile_load(
 
     Example: ctxr profile load frontend
     """
+    context_manager = get_context_manager()
     # Create ProfileManager instance
     profile_manager = ProfileManager(context_manager.storage, context_manager.base_dir)
 
@@ -511,9 +610,7 @@ def profile_load(
 
         # Show file tree if not too many files
         if file_count > 0 and file_count <= 50:
-            console.print(
-                get_file_tree(context_manager.files, context_manager.base_dir)
-            )
+            console.print(context_tree(context_manager))
         elif file_count > 50:
             console.print(
                 f"[dim]Use 'ctxr list' to see all {file_count} files in context[/dim]"
@@ -538,6 +635,7 @@ def profile_delete(
 
     Example: ctxr profile delete frontend
     """
+    context_manager = get_context_manager()
     # Create ProfileManager instance
     profile_manager = ProfileManager(context_manager.storage, context_manager.base_dir)
 
@@ -600,6 +698,7 @@ def profile_new(
 
     Example: ctxr profile new --name frontend --gis
     """
+    context_manager = get_context_manager()
     # Check for unsaved changes
     if context_manager.is_dirty and context_manager.current_profile_name:
         response = typer.prompt(
@@ -690,6 +789,7 @@ def profile_show(
     """
     Show details of a saved profile (metadata, pattern counts, first few patterns).
     """
+    context_manager = get_context_manager()
     profile_manager = ProfileManager(context_manager.storage, context_manager.base_dir)
     try:
         profile = profile_manager.load_profile(name)
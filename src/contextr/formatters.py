@@ -1,58 +1,141 @@
 import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import StringIO
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import (
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    TypeAlias,
+)
 
-from rich.console import Console
+from rich.text import Text
 from rich.tree import Tree
 
+from .utils.path_utils import strip_base_prefix
 
-def get_file_tree(files: Set[str], base_dir: Path) -> Tree:
+# Nested-dict trie of path segments; files map to None, directories to a subtrie
+_PathTrie: TypeAlias = Dict[str, Optional["_PathTrie"]]
+
+
+def _relative_path(file_path: str, base_dir: Path) -> str:
+    """Return file_path relative to base_dir, or resolved absolute if outside."""
+    rel = strip_base_prefix(file_path, os.path.join(str(base_dir), ""))
+    if rel:
+        return rel
+    abs_path = Path(file_path).resolve()
+    try:
+        return str(abs_path.relative_to(base_dir))
+    except ValueError:
+        return str(abs_path)
+
+
+def _relative_paths(
+    files: Set[str], base_dir: Path, rel_paths: Optional[Mapping[str, str]]
+) -> Mapping[str, str]:
+    """Return precomputed relative paths, or compute them once per file."""
+    if rel_paths is not None:
+        return rel_paths
+    return {f: _relative_path(f, base_dir) for f in files}
+
+
+def get_file_tree(
+    files: Set[str],
+    base_dir: Path,
+    rel_paths: Optional[Mapping[str, str]] = None,
+    max_per_dir: Optional[int] = None,
+) -> Tree:
     """
     Generate a Rich Tree representation of the current context files.
 
     Args:
         files: Set of absolute file paths
         base_dir: Base directory for making paths relative
+        rel_paths: Optional precomputed mapping of each file to its path relative
+            to base_dir (e.g. ContextManager.relative_paths()), which avoids
+            resolving every path again
+        max_per_dir: Show at most this many files per directory, followed by a
+            "… (+N more)" node (None shows every file)
 
     Returns:
         Tree: Rich Tree object representing the file hierarchy
     """
-    tree = Tree("📁 [bold]Context[/bold]")
-    dir_groups: Dict[str, List[str]] = {}
-
-    # Group files by their parent directories
-    for file_path in sorted(files):
-        try:
-            rel_path = str(Path(file_path).resolve().relative_to(base_dir))
-            parent_dir = str(Path(rel_path).parent)
-            dir_groups.setdefault(parent_dir, []).append(os.path.basename(rel_path))
-        except ValueError:
-            # For files outside base_dir, use absolute path
-            abs_path = str(Path(file_path).resolve())
-            dir_groups.setdefault(str(Path(abs_path).parent), []).append(
-                os.path.basename(abs_path)
-            )
-
-    # Build a nested tree
-    for dir_path, file_list in sorted(dir_groups.items()):
-        current_node = tree
-        if dir_path != ".":
-            for part in Path(dir_path).parts:
-                found = False
-                for node in current_node.children:
-                    # Remove the "📁 " from node label for matching
-                    label_stripped = str(node.label).replace("📁 ", "")
-                    if label_stripped == part:
-                        current_node = node
-                        found = True
-                        break
-                if not found:
-                    current_node = current_node.add(f"📁 {part}")
+    tree = Tree(Text.assemble("📁 ", ("Context", "bold")))
+    rel_map = _relative_paths(files, base_dir, rel_paths)
+    _add_trie_nodes(tree, _build_trie(files, rel_map), max_per_dir)
+    return tree
 
-        for f in sorted(file_list):
-            current_node.add(f"📄 {f}")
 
-    return tree
+def _build_trie(files: Set[str], rel_map: Mapping[str, str]) -> _PathTrie:
+    """Split each relative path once and insert its segments into a trie."""
+    trie: _PathTrie = {}
+    for file_path in files:
+        parts = rel_map[file_path].replace(os.sep, "/").split("/")
+        if not parts[0]:
+            parts[0] = "/"
+        node = trie
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is None:
+                child = node[part] = {}
+            node = child
+        node[parts[-1]] = None
+    return trie
+
+
+def _trie_children(trie: _PathTrie) -> List[Tuple[str, Optional[_PathTrie]]]:
+    """Return (label, subtrie) pairs of a level: files first, then directories."""
+    names = sorted(trie)
+    files = [(f"📄 {name}", None) for name in names if trie[name] is None]
+    dirs = [(f"📁 {name}", trie[name]) for name in names if trie[name] is not None]
+    return files + dirs
+
+
+def _add_trie_nodes(
+    parent: Tree, trie: _PathTrie, max_per_dir: Optional[int] = None
+) -> None:
+    """Add a trie level to a Rich Tree (plain Text labels, no markup parsing)."""
+    hidden = 0
+    for label, subtrie in _trie_children(trie):
+        if subtrie is None:
+            if max_per_dir is not None and len(parent.children) >= max_per_dir:
+                hidden += 1
+            else:
+                parent.add(Text(label))
+            continue
+        if hidden:
+            # Files come before directories, so every hidden file is counted
+            parent.add(Text(f"… (+{hidden} more)", style="dim"))
+            hidden = 0
+        _add_trie_nodes(parent.add(Text(label)), subtrie, max_per_dir)
+    if hidden:
+        parent.add(Text(f"… (+{hidden} more)", style="dim"))
+
+
+def _render_tree_text(trie: _PathTrie) -> str:
+    """
+    Render a trie as plain text with the same guides as the Rich tree.
+    Used for the export, where Rich's measuring and segment pipeline is
+    pure overhead (and would wrap long lines at the console width).
+    """
+    lines = ["📁 Context"]
+    _append_tree_lines(lines, trie, "")
+    return "\n".join(lines)
+
+
+def _append_tree_lines(lines: List[str], trie: _PathTrie, prefix: str) -> None:
+    children = _trie_children(trie)
+    for i, (label, subtrie) in enumerate(children):
+        last = i == len(children) - 1
+        lines.append(f"{prefix}{'└── ' if last else '├── '}{label}")
+        if subtrie is not None:
+            _append_tree_lines(lines, subtrie, prefix + ("    " if last else "│   "))
 
 
 def detect_language(file_path: str) -> str:
@@ -101,6 +184,11 @@ def detect_language(file_path: str) -> str:
     return lang_map.get(ext, "text")
 
 
+# Upper bound on reader threads and on files read ahead of the writer
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+READ_AHEAD = READ_WORKERS * 4
+
+
 def _choose_fence(text: str, base: str = "```") -> str:
     """Choose a fence sequence not present in text."""
     fence = base
@@ -116,9 +204,23 @@ def _read_text(path: str, max_bytes: int = 512_000) -> Tuple[str, bool]:
     """
     try:
         with open(path, "rb") as fb:
-            raw = fb.read(max_bytes + 1)
-        truncated = len(raw) > max_bytes
-        content = raw[:max_bytes].decode("utf-8", errors="replace")
+            # Read into one buffer sized from fstat (plus a byte to detect
+            # truncation) instead of letting read() grow and copy its result
+            buf = bytearray(min(os.fstat(fb.fileno()).st_size, max_bytes) + 1)
+            filled = 0
+            with memoryview(buf) as view:
+                while filled < len(buf):
+                    n = fb.readinto(view[filled:])
+                    if not n:
+                        break
+                    filled += n
+            if filled == len(buf) and filled <= max_bytes:
+                # The file grew since fstat (or reports no size, e.g. /proc)
+                buf += fb.read(max_bytes + 1 - filled)
+                filled = len(buf)
+        truncated = filled > max_bytes
+        with memoryview(buf) as view:
+            content = str(view[: min(filled, max_bytes)], "utf-8", errors="replace")
         return content, truncated
     except Exception as e:
         return f"[ERROR: Unable to read file: {e}]", False
@@ -130,6 +232,7 @@ def format_export_content(
     relative: bool = True,
     include_contents: bool = True,
     max_bytes: int = 512_000,
+    rel_paths: Optional[Mapping[str, str]] = None,
 ) -> str:
     """
     Format context information for export.
@@ -140,53 +243,109 @@ def format_export_content(
         base_dir: Base directory for making paths relative
         relative: Whether to use relative paths in output
         include_contents: Whether to include file contents
+        max_bytes: Maximum bytes read per file before truncating
+        rel_paths: Optional precomputed mapping of files to relative paths
 
     Returns:
         str: Formatted export content
     """
-    # Create temporary console for capturing tree output
-    temp_console = Console(record=True)
-    temp_console.print(get_file_tree(files, base_dir))
-    tree_text = temp_console.export_text()
+    out = StringIO()
+    write_export_content(
+        out,
+        files,
+        base_dir,
+        relative=relative,
+        include_contents=include_contents,
+        max_bytes=max_bytes,
+        rel_paths=rel_paths,
+    )
+    return out.getvalue()
+
+
+def write_export_content(
+    out: TextIO,
+    files: Set[str],
+    base_dir: Path,
+    relative: bool = True,
+    include_contents: bool = True,
+    max_bytes: int = 512_000,
+    rel_paths: Optional[Mapping[str, str]] = None,
+) -> None:
+    """
+    Write the export format produced by format_export_content to a stream.
+    Each file is written as soon as it is read, so no intermediate list of
+    chunks or joined copy of the whole export is held in memory.
+
+    Args:
+        out: Text stream to write to
+        files: Set of absolute file paths
+        base_dir: Base directory for making paths relative
+        relative: Whether to use relative paths in output
+        include_contents: Whether to include file contents
+        max_bytes: Maximum bytes read per file before truncating
+        rel_paths: Optional precomputed mapping of files to relative paths
+    """
+    # Relative paths are needed by both the tree and the file headings
+    rel_map = _relative_paths(files, base_dir, rel_paths)
+    if not include_contents:
+        _write_export(out, files, base_dir, rel_map, relative, None, max_bytes)
+        return
+
+    # Reads release the GIL, so overlap them with tree rendering and writing.
+    # Only a bounded window is read ahead to keep memory flat on large exports.
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as ex:
+        _write_export(out, files, base_dir, rel_map, relative, ex, max_bytes)
+
+
+def _write_export(
+    out: TextIO,
+    files: Set[str],
+    base_dir: Path,
+    rel_map: Mapping[str, str],
+    relative: bool,
+    ex: Optional[ThreadPoolExecutor],
+    max_bytes: int,
+) -> None:
+    """Write the export; file contents are included when an executor is given."""
+    sorted_files = sorted(files)
+    pending: Deque[Future[Tuple[str, bool]]] = deque()
+    if ex is not None:
+        for fpath in sorted_files[:READ_AHEAD]:
+            pending.append(ex.submit(_read_text, fpath, max_bytes))
+
+    tree_text = _render_tree_text(_build_trie(files, rel_map))
 
     # Format header with project info
     repo_name = base_dir.name
     total_files = len(files)
 
-    output_parts = [
-        f"# Project Context: {repo_name}",
-        f"Files selected: {total_files}",
-        "",
-        "## File Structure",
-        "```",
-        tree_text.strip(),
-        "```",
-        "",
-    ]
+    out.write(
+        f"# Project Context: {repo_name}\n"
+        f"Files selected: {total_files}\n"
+        "\n"
+        "## File Structure\n"
+        "```\n"
+        f"{tree_text.strip()}\n"
+        "```\n"
+    )
 
     # Add file contents if requested
-    if include_contents:
-        output_parts.append("## File Contents")
-
-        for fpath in sorted(files):
-            if relative:
-                try:
-                    path_str = str(Path(fpath).resolve().relative_to(base_dir))
-                except ValueError:
-                    path_str = str(Path(fpath).resolve())
-            else:
-                path_str = fpath
+    if ex is not None:
+        out.write("\n## File Contents")
+
+        for i, fpath in enumerate(sorted_files):
+            path_str = rel_map[fpath] if relative else fpath
 
             # Detect language for syntax highlighting
             lang = detect_language(path_str)
 
-            output_parts.append(f"\n### {path_str}")
-            content, truncated = _read_text(fpath, max_bytes=max_bytes)
+            content, truncated = pending.popleft().result()
+            if i + READ_AHEAD < len(sorted_files):
+                next_path = sorted_files[i + READ_AHEAD]
+                pending.append(ex.submit(_read_text, next_path, max_bytes))
             fence = _choose_fence(content, base="```")
-            output_parts.append(f"{fence}{lang}")
-            output_parts.append(content)
+            out.write(f"\n\n### {path_str}\n{fence}{lang}\n")
+            out.write(content)
             if truncated:
-                output_parts.append("\n[... truncated ...]")
-            output_parts.append(f"{fence}")
-
-    return "\n".join(output_parts)
+                out.write("\n\n[... truncated ...]")
+            out.write(f"\n{fence}")
@@ -1,12 +1,32 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, TypeAlias
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeAlias,
+)
 
 from rich.console import Console
 
 from .profile import Profile
 from .storage import JsonStorage, StorageBackend
+from .utils.dir_cache import DirEntryLike, DirListingCache, ListDir
 from .utils.ignore_utils import IgnoreManager
-from .utils.path_utils import make_absolute, make_relative, normalize_paths
+from .utils.path_utils import (
+    make_absolute,
+    make_relative,
+    normalize_paths,
+    scandir_recursive,
+    strip_base_prefix,
+)
 
 # Type aliases for clarity
 FilePath: TypeAlias = str
@@ -15,6 +35,9 @@ FileStats: TypeAlias = Dict[str, int]
 
 console = Console()
 
+# Threads walking independent directory roots; listing is syscall-bound
+WALK_WORKERS = 8
+
 
 class ContextManager:
     """
@@ -30,21 +53,80 @@ class ContextManager:
     Args:
         storage: Optional storage backend implementation. If not provided,
                 defaults to JsonStorage using the .contextr directory.
+        base_dir: Optional project directory. Defaults to the current
+                working directory.
     """
 
-    def __init__(self, storage: Optional[StorageBackend] = None) -> None:
+    def __init__(
+        self,
+        storage: Optional[StorageBackend] = None,
+        base_dir: Optional[Path] = None,
+    ) -> None:
+        # Memo of absolute path -> base_dir-relative path (see relative_path)
+        self._rel_cache: Dict[FilePath, FilePath] = {}
+        # Lowercased paths for case-insensitive search, filled on first query
+        self._lower_cache: Dict[FilePath, str] = {}
         self.files: Set[FilePath] = set()
         self.watched_patterns: Set[Pattern] = set()
-        self.base_dir: Path = Path.cwd()
+        self.base_dir = base_dir.resolve() if base_dir else Path.cwd()
         self.state_dir: Path = self.base_dir / ".contextr"
         self.state_file: Path = self.state_dir / "state.json"
         self.storage: StorageBackend = storage or JsonStorage(self.state_dir)
         self.ignore_manager: IgnoreManager = IgnoreManager(self.base_dir)
+        # Directory listings reused across runs while directory mtimes are unchanged
+        self.dir_cache: DirListingCache = DirListingCache(
+            self.state_dir / "cache" / "dirs.json"
+        )
         self.current_profile_name: Optional[str] = None
         self.is_dirty: bool = False
         self._initial_state: Optional[Dict[str, List[str]]] = None
+        # Last state read from or written to storage; equal states are not rewritten
+        self._saved_state: Optional[Dict[str, Any]] = None
+        self._batch_depth = 0
+        self._save_pending = False
         self._load_state()
 
+    @property
+    def base_dir(self) -> Path:
+        """Directory that relative paths and patterns are resolved against."""
+        return self._base_dir
+
+    @base_dir.setter
+    def base_dir(self, value: Path) -> None:
+        self._base_dir = value
+        self._base_prefix = os.path.join(str(value.resolve()), "")
+        self._rel_cache.clear()
+
+    def relative_path(self, path: FilePath) -> FilePath:
+        """
+        Return path relative to base_dir, computing it at most once per path.
+
+        Args:
+            path: Absolute file path
+
+        Returns:
+            str: Relative path (or resolved absolute path if outside base_dir)
+        """
+        rel = self._rel_cache.get(path)
+        if rel is None:
+            # Paths found by walking base_dir only need their prefix sliced off
+            rel = strip_base_prefix(path, self._base_prefix)
+            if not rel:
+                rel = make_relative(path, self._base_dir)
+            self._rel_cache[path] = rel
+        return rel
+
+    def relative_paths(self) -> Dict[FilePath, FilePath]:
+        """
+        Map every file in the context to its path relative to base_dir.
+        Pass the result to get_file_tree/format_export_content so they do not
+        resolve each path again.
+
+        Returns:
+            Dict[str, str]: Absolute file path -> relative path
+        """
+        return {f: self.relative_path(f) for f in self.files}
+
     def add_ignore_patterns(self, patterns: List[Pattern]) -> Tuple[int, int]:
         """
         Add new patterns to .ignore and update current context (single refresh).
@@ -55,12 +137,24 @@ class ContextManager:
         Returns:
             Tuple[int, int]: (Number of files removed, Number of directories cleaned)
         """
-        for p in patterns:
-            self.ignore_manager.add_pattern(p)
+        redundant = all(self.ignore_manager.is_redundant(p) for p in patterns)
+        self.ignore_manager.add_patterns(patterns)
+        if redundant:
+            # Existing rules already exclude everything these patterns match
+            return 0, 0
         before = set(self.files)
-        self.refresh_watched()
+        # Rules are appended last, so filter the current context in memory
+        # instead of re-walking; files outside watched paths stay unless a
+        # rule now ignores them
+        self.files -= {f for f in self.files if self.ignore_manager.should_ignore(f)}
+        if any(p.strip().startswith("!") for p in patterns):
+            # Negations can bring watched files back: add them on top of the
+            # current context rather than rebuilding it from watched paths
+            self._add_files(sorted(self.watched_patterns), persist=False)
+            self.dir_cache.save()
+        self._save_state()
         removed = before - self.files
-        cleaned_dirs = {str(Path(p).parent) for p in removed}
+        cleaned_dirs = {os.path.dirname(p) for p in removed}
         # Prefer accurate removal count from diff
         return len(removed), len(cleaned_dirs)
 
@@ -112,21 +206,19 @@ class ContextManager:
 
         # Read .gitignore patterns and trim inline comments (pattern " # comment")
         gitignore_patterns: List[Pattern] = []
-        with open(gitignore_path, "r", encoding="utf-8") as f:
-            for line in f:
-                s = line.strip()
-                if not s or s.startswith("#"):
-                    continue
-                # Remove simple inline comments (not escaped)
-                if " #" in s:
-                    s = s.split(" #", 1)[0].rstrip()
-                gitignore_patterns.append(s)
+        for line in gitignore_path.read_text(encoding="utf-8").split("\n"):
+            s = line.strip()
+            if not s or s.startswith("#"):
+                continue
+            # Remove simple inline comments (not escaped)
+            if " #" in s:
+                s = s.split(" #", 1)[0].rstrip()
+            gitignore_patterns.append(s)
 
         existing = set(self.ignore_manager.list_patterns())  # includes '!'-prefixed
         new_patterns_list = [p for p in gitignore_patterns if p not in existing]
 
-        for pattern in new_patterns_list:
-            self.ignore_manager.add_pattern(pattern)
+        self.ignore_manager.add_patterns(new_patterns_list)
 
         return len(new_patterns_list), new_patterns_list
 
@@ -153,10 +245,9 @@ class ContextManager:
         try:
             data = self.storage.load("state")
             if data:
+                self._saved_state = data
                 # Validate and load files
-                self.files = set(
-                    make_absolute(p, self.base_dir) for p in data.get("files", [])
-                )
+                self.files = self._load_files(data.get("files", []))
                 # Validate and load watched patterns
                 self.watched_patterns = set(data.get("watched_patterns", []))
                 # Load profile tracking state
@@ -166,49 +257,170 @@ class ContextManager:
         except IOError as e:
             console.print(f"[red]Error loading state: {e}[/red]")
 
+    def _load_files(self, stored: List[FilePath]) -> Set[FilePath]:
+        """
+        Convert stored relative paths to absolute ones for self.files.
+
+        Stored paths were produced by relative_path(), which slices walked
+        paths off the resolved base_dir, so plain relative entries are joined
+        back onto it without a resolve() per file. Each one is also recorded as
+        the relative form of its absolute path, so saving the state again needs
+        no second lookup either. Absolute, '~' and '$' entries go through
+        make_absolute.
+        """
+        files: Set[FilePath] = set()
+        for rel in stored:
+            if os.path.isabs(rel) or rel.startswith("~") or "$" in rel:
+                files.add(make_absolute(rel, self.base_dir))
+                continue
+            abs_path = os.path.normpath(self._base_prefix + rel)
+            files.add(abs_path)
+            self._rel_cache[abs_path] = rel
+        return files
+
+    @contextmanager
+    def batched_saves(self) -> Generator[None, None, None]:
+        """
+        Defer state writes until the block exits, then save at most once.
+
+        Scripts applying many add/remove/watch calls in a row would otherwise
+        rewrite state.json after each one. Blocks may be nested; the write
+        happens when the outermost one exits, even if it raised.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._save_pending:
+                self._save_pending = False
+                self._save_state()
+
     def _save_state(self) -> None:
-        """Save current state (files and watched patterns) to storage."""
+        """
+        Save current state (files and watched patterns) to storage.
+
+        Nothing is written when the state equals the last one loaded or saved,
+        or while inside batched_saves().
+        """
+        if self._batch_depth:
+            self._save_pending = True
+            return
         try:
-            data = {
-                "files": [make_relative(p, self.base_dir) for p in sorted(self.files)],
+            data: Dict[str, Any] = {
+                "files": [self.relative_path(p) for p in sorted(self.files)],
                 "watched_patterns": sorted(
                     self.watched_patterns
                 ),  # Save watched patterns
                 "current_profile": self.current_profile_name,
             }
-            self.storage.save("state", data)
+            if data != self._saved_state:
+                self.storage.save("state", data)
+                self._saved_state = data
             # Check if state has changed
             self._check_dirty_state()
         except IOError as e:
             console.print(f"[red]Error saving state: {e}[/red]")
 
+    def _walk_lister(self) -> ListDir:
+        """
+        Build the directory lister for one add/refresh pass.
+
+        Listings are memoized for the pass, so patterns sharing a root (e.g.
+        'src/**/*.py' and 'src/**/*.md') list each directory once. Without
+        negation rules nothing below an ignored directory can be included, so
+        such directories are dropped from listings and never descended into.
+
+        Returns:
+            ListDir: Directory listing function for normalize_paths and walks
+        """
+        listings: Dict[str, Sequence[DirEntryLike]] = {}
+        ignore = self.ignore_manager
+        prune = not ignore.get_negation_patterns_set()
+
+        def is_ignored_dir(entry: DirEntryLike) -> bool:
+            try:
+                return entry.is_dir() and ignore.should_ignore(entry.path)
+            except OSError:
+                return False
+
+        def list_dir(path: str) -> Sequence[DirEntryLike]:
+            entries = listings.get(path)
+            if entries is None:
+                entries = self.dir_cache.list_dir(path)
+                if prune:
+                    entries = [e for e in entries if not is_ignored_dir(e)]
+                listings[path] = entries
+            return entries
+
+        return list_dir
+
     def _add_files(self, patterns: List[Pattern], persist: bool = True) -> int:
         """Internal method to add files, respecting ignore patterns."""
-        abs_paths = normalize_paths(patterns, self.base_dir, self.ignore_manager)
+        list_dir = self._walk_lister()
+        abs_paths = normalize_paths(
+            patterns, self.base_dir, self.ignore_manager, list_dir
+        )
         if not abs_paths:
             return 0
 
         new_files_count = 0
+        walk_roots: List[str] = []
         for path_str in abs_paths:
-            p = Path(path_str)
-            if p.is_file() and not self.ignore_manager.should_ignore(path_str):
-                if path_str not in self.files:
-                    new_files_count += 1
-                self.files.add(path_str)
-            elif p.is_dir():
-                # Add all files within the directory that aren't ignored
-                for file_path in p.rglob("*"):
-                    if file_path.is_file():
-                        file_abs = str(file_path.resolve())
-                        if not self.ignore_manager.should_ignore(file_abs):
-                            if file_abs not in self.files:
-                                new_files_count += 1
-                            self.files.add(file_abs)
+            if os.path.isfile(path_str):
+                if not self.ignore_manager.should_ignore(path_str):
+                    if path_str not in self.files:
+                        new_files_count += 1
+                    self.files.add(path_str)
+            elif os.path.isdir(path_str):
+                walk_roots.append(path_str)
+
+        # Add all files within the directories that aren't ignored
+        for file_abs in self._walk_files(walk_roots, list_dir):
+            if file_abs not in self.files:
+                new_files_count += 1
+            self.files.add(file_abs)
 
         if persist:
             self._save_state()
         return new_files_count
 
+    def _walk_files(self, roots: List[str], list_dir: ListDir) -> List[FilePath]:
+        """
+        Collect the non-ignored files below each root directory.
+
+        Symlinked files, and roots reached through a symlink, are reported by
+        their resolved path. Several roots are walked on a thread pool: scandir
+        and stat release the GIL, so independent subtrees are listed
+        concurrently.
+
+        Args:
+            roots: Directories to walk
+            list_dir: Directory lister from _walk_lister()
+
+        Returns:
+            List[str]: Absolute paths of the files found, in walk order
+        """
+        ignore = self.ignore_manager
+
+        def walk(root: str) -> List[FilePath]:
+            # Symlinks are recorded (and matched against ignore rules) by their
+            # target, so a link into an ignored directory stays ignored. The
+            # listing already tells which entries are links: no extra stat().
+            files: List[FilePath] = []
+            for e in scandir_recursive(os.path.realpath(root), list_dir):
+                path = e.path
+                if not e.is_file(follow_symlinks=False):
+                    path = os.path.realpath(path)
+                if not ignore.should_ignore(path):
+                    files.append(path)
+            return files
+
+        if len(roots) < 2:
+            return walk(roots[0]) if roots else []
+        with ThreadPoolExecutor(max_workers=min(WALK_WORKERS, len(roots))) as ex:
+            return [f for files in ex.map(walk, roots) for f in files]
+
     def _remove_files(self, patterns: List[Pattern]) -> int:
         """
         Internal method to remove files or directories from the context.
@@ -225,20 +437,25 @@ class ContextManager:
             return 0
 
         files_to_remove: Set[FilePath] = set()
+        dir_prefixes: List[str] = []
         for path_str in abs_paths:
-            p = Path(path_str)
-            if p.is_file():
+            if os.path.isfile(path_str):
                 if path_str in self.files:
                     files_to_remove.add(path_str)
-            elif p.is_dir():
-                # Remove all files under that directory
-                for file_path in p.rglob("*"):
-                    fp_str = str(file_path.resolve())
-                    if fp_str in self.files:
-                        files_to_remove.add(fp_str)
+            elif os.path.isdir(path_str):
+                dir_prefixes.append(os.path.join(path_str, ""))
+        if dir_prefixes:
+            # Remove all context files under those directories; matching on the
+            # path prefixes needs no walk of the directories and one pass over
+            # the context however many directories were given
+            prefixes = tuple(dir_prefixes)
+            files_to_remove.update(f for f in self.files if f.startswith(prefixes))
 
         removed_count = len(files_to_remove)
         self.files -= files_to_remove
+        for fp in files_to_remove:
+            self._rel_cache.pop(fp, None)
+            self._lower_cache.pop(fp, None)
         self._save_state()
         return removed_count
 
@@ -251,6 +468,8 @@ class ContextManager:
             - Saves empty state to disk
         """
         self.files.clear()
+        self._rel_cache.clear()
+        self._lower_cache.clear()
         self._save_state()
 
     def clear(self, preserve_ignores: bool = True) -> None:
@@ -265,6 +484,8 @@ class ContextManager:
             - Saves empty state to disk
         """
         self.files.clear()
+        self._rel_cache.clear()
+        self._lower_cache.clear()
         self.watched_patterns.clear()
         if not preserve_ignores:
             try:
@@ -283,11 +504,16 @@ class ContextManager:
         Returns:
             List[str]: List of matching file paths (relative to base_dir)
         """
-        return [
-            make_relative(f, self.base_dir)
-            for f in self.files
-            if keyword.lower() in f.lower()
-        ]
+        keyword = keyword.lower()
+        lower = self._lower_cache
+        matches: List[FilePath] = []
+        for f in self.files:
+            f_lower = lower.get(f)
+            if f_lower is None:
+                f_lower = lower[f] = f.lower()
+            if keyword in f_lower:
+                matches.append(self.relative_path(f))
+        return matches
 
     def get_file_paths(self, relative: bool = True) -> List[FilePath]:
         """
@@ -300,7 +526,7 @@ class ContextManager:
             List[str]: List of file paths
         """
         if relative:
-            return [make_relative(f, self.base_dir) for f in sorted(self.files)]
+            return [self.relative_path(f) for f in sorted(self.files)]
         return sorted(self.files)
 
     def unwatch_paths(self, patterns: List[Pattern]) -> Tuple[int, int]:
@@ -351,6 +577,7 @@ class ContextManager:
         added_count = self._add_files(patterns)
 
         self._save_state()
+        self.dir_cache.save()
         return len(new_patterns), added_count
 
     def refresh_watched(self) -> FileStats:
@@ -367,15 +594,16 @@ class ContextManager:
         # Clear files that came from watched patterns
         self.files.clear()
 
-        # Re-add all files from watched patterns; persist once at end
-        for pattern in self.watched_patterns:
-            added = self._add_files([pattern], persist=False)
-            stats["added"] += added
+        # Re-add all files from watched patterns in one pass (so directories
+        # shared between patterns are listed once); persist once at end
+        stats["added"] = self._add_files(sorted(self.watched_patterns), persist=False)
 
         # Count removed files
         stats["removed"] = len(old_files - self.files)
         # Single save for the whole refresh
         self._save_state()
+        # Every watched path was just listed, so unvisited directories are stale
+        self.dir_cache.save(prune=True)
 
         return stats
 
@@ -409,7 +637,7 @@ class ContextManager:
 
         try:
             data = {
-                "files": [make_relative(p, self.base_dir) for p in sorted(self.files)],
+                "files": [self.relative_path(p) for p in sorted(self.files)],
                 "watched_patterns": sorted(self.watched_patterns),
                 "ignore_patterns": sorted(
                     self.ignore_manager.get_normal_patterns_set()
@@ -447,9 +675,7 @@ class ContextManager:
                 return False
 
             # Load files with validation
-            self.files = set(
-                make_absolute(p, self.base_dir) for p in data.get("files", [])
-            )
+            self.files = self._load_files(data.get("files", []))
 
             # Load watched patterns with validation
             self.watched_patterns = set(data.get("watched_patterns", []))
@@ -7,13 +7,15 @@ Repo-level ignore rules live in .contextr/.ignore and are not part of a profile.
 import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TypeAlias
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypeAlias
 
 from rich.console import Console
-from rich.table import Table
 
 from .storage import StorageBackend
 
+if TYPE_CHECKING:
+    from rich.table import Table
+
 # Type aliases for clarity
 ProfileName: TypeAlias = str
 Pattern: TypeAlias = str
@@ -163,12 +165,11 @@ class ProfileManager:
         Returns:
             List[Profile]: List of saved profiles sorted by name
         """
-        profile_keys = self.storage.list_keys("profiles/")
         profiles: List[Profile] = []
 
-        for key in profile_keys:
+        # One directory listing + direct reads instead of list_keys + load per key
+        for key, data in self.storage.load_prefix("profiles/").items():
             profile_name = key.replace("profiles/", "")
-            data = self.storage.load(key)
             if data:
                 try:
                     profile = Profile.from_dict(data)
@@ -243,7 +244,7 @@ class ProfileManager:
 
         return bool(PROFILE_NAME_PATTERN.match(name))
 
-    def format_profiles_table(self, profiles: List[Profile]) -> Table:
+    def format_profiles_table(self, profiles: List[Profile]) -> "Table":
         """Format profiles as a Rich table.
 
         Args:
@@ -252,6 +253,8 @@ class ProfileManager:
         Returns:
             Table: Formatted table for display
         """
+        from rich.table import Table
+
         table = Table(title="Saved Profiles", show_lines=True)
         table.add_column("Name", style="cyan", no_wrap=True)
         table.add_column("Description", style="white")
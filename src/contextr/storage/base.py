@@ -77,3 +77,25 @@ class StorageBackend(ABC):
             List[str]: List of keys matching the prefix
         """
         pass
+
+    def load_prefix(self, prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        """Load every entry whose key starts with prefix.
+
+        The default implementation calls list_keys() and then load() per key;
+        backends that can enumerate and read in one pass should override it.
+
+        Args:
+            prefix: Optional prefix to filter keys
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Loaded data by key, in sorted key order
+
+        Raises:
+            IOError: If loading any entry fails
+        """
+        result: Dict[str, Dict[str, Any]] = {}
+        for key in self.list_keys(prefix):
+            data = self.load(key)
+            if data:
+                result[key] = data
+        return result
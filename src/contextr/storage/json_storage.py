@@ -1,9 +1,11 @@
 """JSON file-based storage backend implementation."""
 
 import json
+import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from ..utils.json_utils import dumps, loads
 from .base import StorageBackend
 
 
@@ -14,6 +16,11 @@ class JsonStorage(StorageBackend):
     Each key maps to a separate JSON file.
     """
 
+    # Keys rewritten on nearly every command and never edited by hand; these
+    # are stored compact. Everything else (profiles, named states) keeps the
+    # readable indented layout users diff and commit.
+    COMPACT_KEYS = frozenset({"state"})
+
     def __init__(self, base_path: Path) -> None:
         """Initialize JSON storage backend.
 
@@ -64,8 +71,12 @@ class JsonStorage(StorageBackend):
 
         try:
             # Write to temporary file first
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, sort_keys=True)
+            if key in self.COMPACT_KEYS:
+                with open(temp_path, "wb") as f:
+                    f.write(dumps(data))
+            else:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=4, sort_keys=True)
 
             # Atomically rename temp file to target file
             temp_path.replace(file_path)
@@ -95,8 +106,8 @@ class JsonStorage(StorageBackend):
             return None
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(file_path, "rb") as f:
+                data = loads(f.read())
             return data
         except json.JSONDecodeError as e:
             raise IOError(f"Failed to parse JSON: {e}") from e
@@ -157,6 +168,8 @@ class JsonStorage(StorageBackend):
             if search_dir.exists():
                 pattern = f"{prefix_parts[-1]}*.json" if prefix_parts[-1] else "*.json"
                 for file_path in search_dir.glob(pattern):
+                    if file_path.name.startswith("."):
+                        continue
                     # Reconstruct the full key
                     relative_path = file_path.relative_to(self.base_path)
                     key = str(relative_path).replace("\\", "/")
@@ -167,8 +180,57 @@ class JsonStorage(StorageBackend):
             # Search in base directory
             pattern = f"{prefix}*.json" if prefix else "*.json"
             for file_path in self.base_path.glob(pattern):
-                if file_path.is_file():
+                if file_path.is_file() and not file_path.name.startswith("."):
                     key = file_path.stem
                     keys.append(key)
 
         return sorted(keys)
+
+    def load_prefix(self, prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        """Load every entry whose key starts with prefix.
+
+        Lists the target directory once with os.scandir and reads each matching
+        file directly, instead of a glob followed by an existence check and
+        open per key.
+
+        Args:
+            prefix: Optional prefix to filter keys
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Loaded data by key, in sorted key order
+
+        Raises:
+            IOError: If a matching file cannot be read or parsed
+        """
+        dir_part, _, name_prefix = prefix.rpartition("/")
+        search_dir = self.base_path / dir_part if dir_part else self.base_path
+        key_prefix = f"{dir_part}/" if dir_part else ""
+
+        try:
+            with os.scandir(search_dir) as it:
+                entries = [
+                    e
+                    for e in it
+                    if e.name.endswith(".json")
+                    and e.name.startswith(name_prefix)
+                    and not e.name.startswith(".")
+                    and e.is_file()
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+
+        result: Dict[str, Dict[str, Any]] = {}
+        for entry in sorted(entries, key=lambda e: e.name):
+            try:
+                with open(entry.path, "rb") as f:
+                    data = loads(f.read())
+            except FileNotFoundError:
+                # Removed between listing and reading
+                continue
+            except json.JSONDecodeError as e:
+                raise IOError(f"Failed to parse JSON: {e}") from e
+            except OSError as e:
+                raise IOError(f"Failed to load data: {e}") from e
+            if data:
+                result[key_prefix + entry.name[:-5]] = data
+        return result
@@ -0,0 +1,70 @@
+"""Clipboard access that pipes the export straight to the platform's tool."""
+
+import os
+import shutil
+import subprocess
+import sys
+from functools import cache
+from typing import List, Optional
+
+
+@cache
+def clipboard_command() -> Optional[List[str]]:
+    """
+    Detect the clipboard command for this platform (once per process).
+
+    macOS uses pbcopy; Linux prefers wl-copy under Wayland, then xclip or xsel
+    under X11. Other platforms (e.g. Windows, where pyperclip already talks to
+    the clipboard through ctypes) return None.
+
+    Returns:
+        Optional[List[str]]: Command reading the payload from stdin, or None
+    """
+    if sys.platform == "darwin":
+        return ["pbcopy"] if shutil.which("pbcopy") else None
+    if not sys.platform.startswith("linux"):
+        return None
+    if os.environ.get("WAYLAND_DISPLAY") and shutil.which("wl-copy"):
+        return ["wl-copy"]
+    if os.environ.get("DISPLAY"):
+        if shutil.which("xclip"):
+            return ["xclip", "-selection", "clipboard"]
+        if shutil.which("xsel"):
+            return ["xsel", "--clipboard", "--input"]
+    return None
+
+
+def copy_to_clipboard(text: str) -> None:
+    """
+    Copy text to the system clipboard.
+
+    The payload is written to the detected tool's stdin in one call, skipping
+    pyperclip's per-call backend lookup. Falls back to pyperclip when no tool
+    was detected.
+
+    Args:
+        text: Text to copy
+
+    Raises:
+        Exception: If the clipboard tool is missing or fails
+    """
+    command = clipboard_command()
+    if command is None:
+        # Imported lazily: pyperclip probes for clipboard tools on import
+        import pyperclip
+
+        pyperclip.copy(text)
+        return
+
+    env = None
+    if command[0] == "pbcopy":
+        # pbcopy decodes stdin using the locale; force UTF-8
+        env = {**os.environ, "LC_CTYPE": "UTF-8"}
+    subprocess.run(
+        command,
+        input=text.encode("utf-8"),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        check=True,
+    )
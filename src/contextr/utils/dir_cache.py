@@ -0,0 +1,212 @@
+"""Directory listing helpers with an optional mtime-validated on-disk cache."""
+
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Protocol, Sequence, Set, Tuple
+
+from .json_utils import dumps, loads
+
+# Listings of directories modified less than this long before they were scanned
+# are not trusted, since a later change within the same mtime tick would go
+# unnoticed (the same "racy" window git guards against).
+RACY_NS = 2_000_000_000
+
+_DIR_NOFOLLOW = 1
+_DIR = 2
+_FILE_NOFOLLOW = 4
+_FILE = 8
+
+
+class DirEntryLike(Protocol):
+    """The subset of os.DirEntry used by the directory walkers."""
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def path(self) -> str: ...
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool: ...
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool: ...
+
+
+ListDir = Callable[[str], Sequence[DirEntryLike]]
+
+
+def scan_dir(path: str) -> Sequence[DirEntryLike]:
+    """List a directory, treating unreadable or missing paths as empty."""
+    try:
+        with os.scandir(path or os.curdir) as it:
+            return list(it)
+    except OSError:
+        return []
+
+
+def _entry_flags(entry: DirEntryLike) -> int:
+    # Only the entry's own type is cached: a symlink's target can change without
+    # touching this directory's mtime, so CachedDirEntry re-stats it instead
+    try:
+        if entry.is_dir(follow_symlinks=False):
+            return _DIR_NOFOLLOW | _DIR
+        if entry.is_file(follow_symlinks=False):
+            return _FILE_NOFOLLOW | _FILE
+    except OSError:
+        pass
+    return 0
+
+
+class CachedDirEntry:
+    """A directory entry restored from the listing cache."""
+
+    __slots__ = ("_dir", "name", "_flags", "_target")
+
+    def __init__(self, dir_path: str, name: str, flags: int) -> None:
+        self._dir = dir_path
+        self.name = name
+        self._flags = flags
+        self._target: Optional[int] = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self._dir, self.name) if self._dir else self.name
+
+    def _followed_flags(self) -> int:
+        if self._flags & (_DIR_NOFOLLOW | _FILE_NOFOLLOW):
+            return self._flags
+        if self._target is None:
+            # Symlink (or special file): stat the current target, like DirEntry
+            try:
+                mode = os.stat(self.path).st_mode
+            except OSError:
+                mode = 0
+            self._target = (_DIR if stat.S_ISDIR(mode) else 0) | (
+                _FILE if stat.S_ISREG(mode) else 0
+            )
+        return self._target
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks:
+            return bool(self._followed_flags() & _DIR)
+        return bool(self._flags & _DIR_NOFOLLOW)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks:
+            return bool(self._followed_flags() & _FILE)
+        return bool(self._flags & _FILE_NOFOLLOW)
+
+
+# dir path -> (dir mtime_ns, scanned at ns, [(name, flags), ...])
+_Listing = Tuple[int, int, List[Tuple[str, int]]]
+
+
+class DirListingCache:
+    """
+    Cache of directory listings keyed by path and validated by directory mtime.
+
+    Adding, removing or renaming an entry updates its parent directory's mtime,
+    so a directory whose mtime is unchanged can reuse its cached listing: one
+    stat() replaces opening and reading the directory. Listings are raw (not
+    filtered by ignore rules), so ignore-pattern changes need no invalidation.
+
+    Args:
+        cache_file: JSON file the cache is persisted to, inside a dedicated
+            cache directory
+    """
+
+    def __init__(self, cache_file: Path) -> None:
+        self.cache_file = cache_file
+        self._dirs: Optional[Dict[str, _Listing]] = None
+        self._seen: Set[str] = set()
+        self._dirty = False
+        # Walks of several roots list directories from worker threads
+        self._load_lock = threading.Lock()
+
+    def _load(self) -> Dict[str, _Listing]:
+        if self._dirs is not None:
+            return self._dirs
+        with self._load_lock:
+            if self._dirs is None:
+                dirs: Dict[str, _Listing] = {}
+                try:
+                    with open(self.cache_file, "rb") as f:
+                        raw = loads(f.read())
+                    for path, (mtime, scanned, entries) in raw.get("dirs", {}).items():
+                        dirs[path] = (
+                            int(mtime),
+                            int(scanned),
+                            [(str(n), int(fl)) for n, fl in entries],
+                        )
+                except (OSError, ValueError, TypeError, AttributeError):
+                    # Missing or unreadable cache: start empty
+                    dirs = {}
+                self._dirs = dirs
+            return self._dirs
+
+    def list_dir(self, path: str) -> Sequence[DirEntryLike]:
+        """
+        List a directory, reusing the cached listing if its mtime is unchanged.
+
+        Args:
+            path: Directory to list
+
+        Returns:
+            Sequence[DirEntryLike]: Entries of the directory (empty if unreadable)
+        """
+        dirs = self._load()
+        self._seen.add(path)
+        try:
+            mtime = os.stat(path or os.curdir).st_mtime_ns
+        except OSError:
+            if dirs.pop(path, None) is not None:
+                self._dirty = True
+            return []
+
+        cached = dirs.get(path)
+        if cached is not None and cached[0] == mtime and cached[1] - mtime > RACY_NS:
+            return [CachedDirEntry(path, name, flags) for name, flags in cached[2]]
+
+        scanned = time.time_ns()
+        entries = scan_dir(path)
+        dirs[path] = (mtime, scanned, [(e.name, _entry_flags(e)) for e in entries])
+        self._dirty = True
+        return entries
+
+    def save(self, prune: bool = False) -> None:
+        """
+        Persist the cache if it changed. The cache directory is created with a
+        catch-all .gitignore; nothing is written when its parent is missing
+        (e.g. before 'ctxr init'). Write errors are ignored.
+
+        Args:
+            prune: Drop directories not listed during this session
+        """
+        if self._dirs is None:
+            return
+        if prune:
+            stale = self._dirs.keys() - self._seen
+            if stale:
+                for path in stale:
+                    del self._dirs[path]
+                self._dirty = True
+        cache_dir = self.cache_file.parent
+        if not self._dirty or not cache_dir.parent.is_dir():
+            return
+        temp_path = self.cache_file.with_suffix(".tmp")
+        try:
+            if not cache_dir.is_dir():
+                cache_dir.mkdir()
+                # Machine-local data: keep it out of version control
+                (cache_dir / ".gitignore").write_text("*\n", encoding="utf-8")
+            with open(temp_path, "wb") as f:
+                f.write(dumps({"dirs": self._dirs}))
+            temp_path.replace(self.cache_file)
+            self._dirty = False
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
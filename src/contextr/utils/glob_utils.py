@@ -0,0 +1,195 @@
+"""Glob expansion built on os.scandir with literal-prefix peeling."""
+
+import fnmatch
+import os
+import re
+from functools import lru_cache
+from typing import Iterator, List, Optional, Pattern, Sequence, Tuple, TypeAlias
+
+from .dir_cache import DirEntryLike, ListDir, scan_dir
+
+MAGIC_CHARS = "*?["
+_SEPARATORS = re.compile(r"[\\/]" if os.name == "nt" else r"/")
+
+# Directory queued by a '**' walk: (path, listing if known, real path)
+_WalkItem: TypeAlias = Tuple[str, Optional[Sequence[DirEntryLike]], str]
+
+
+def has_magic(segment: str) -> bool:
+    """Return True if a path segment contains glob wildcards."""
+    return any(c in segment for c in MAGIC_CHARS)
+
+
+def split_pattern(pattern: str) -> Tuple[str, List[str]]:
+    """
+    Split a glob pattern into its literal prefix and wildcard tail.
+
+    Leading segments without wildcards are joined as-is (no filesystem access);
+    everything from the first wildcard segment onwards is returned as a list.
+
+    Args:
+        pattern: Glob pattern (absolute or relative)
+
+    Returns:
+        Tuple[str, List[str]]: (literal prefix path, remaining segments)
+    """
+    drive, rest = os.path.splitdrive(pattern)
+    parts = _SEPARATORS.split(rest)
+    literal: List[str] = []
+    for i, part in enumerate(parts):
+        if has_magic(part):
+            tail = [p for p in parts[i:] if p]
+            return drive + os.sep.join(literal), tail
+        literal.append(part)
+    return drive + os.sep.join(literal), []
+
+
+def expand_glob(
+    pattern: str, list_dir: ListDir = scan_dir, resolve_links: bool = False
+) -> List[str]:
+    """
+    Expand a glob pattern (with recursive '**' support) to matching paths.
+
+    Mirrors glob.glob(pattern, recursive=True): names starting with '.' only
+    match segments that start with '.', and '**' matches zero or more
+    directories. The walk starts at the literal prefix of the pattern and
+    existence checks are deferred until a wildcard segment is reached.
+    Like glob, '**' follows symlinked directories; a directory whose real path
+    was already walked is not entered again, which also stops symlink cycles.
+
+    Args:
+        pattern: Glob pattern to expand
+        list_dir: Directory listing function (e.g. a DirListingCache's list_dir)
+        resolve_links: Return each match's real path instead of the path it
+            was reached by. Real paths are tracked during the walk, so only
+            symlinks cost an os.path.realpath call.
+
+    Returns:
+        List[str]: Matching paths
+    """
+    dir_only = pattern.endswith(("/", os.sep))
+    root, tail = split_pattern(pattern.rstrip("/" + os.sep) or pattern)
+    if not tail:
+        exists = os.path.isdir(root) if dir_only else os.path.lexists(root)
+        if not exists:
+            return []
+        return [os.path.realpath(root) if resolve_links else root]
+    root_real = os.path.realpath(root or os.curdir)
+    index = 1 if resolve_links else 0
+    return [m[index] for m in _select(root, root_real, tail, dir_only, list_dir)]
+
+
+def _is_dir(entry: DirEntryLike, follow_symlinks: bool = True) -> bool:
+    try:
+        return entry.is_dir(follow_symlinks=follow_symlinks)
+    except OSError:
+        return False
+
+
+def _join(path: str, name: str) -> str:
+    return os.path.join(path, name) if path else name
+
+
+@lru_cache(maxsize=1024)
+def _compile_segment(segment: str) -> Pattern[str]:
+    """Compile a single glob segment to a regex (case-insensitive on Windows)."""
+    return re.compile(
+        fnmatch.translate(segment), re.IGNORECASE if os.name == "nt" else 0
+    )
+
+
+def _real_child(entry: DirEntryLike, child: str, real: str) -> str:
+    """Real path of a listed entry, given the real path of its directory."""
+    try:
+        plain = entry.is_dir(follow_symlinks=False) or entry.is_file(
+            follow_symlinks=False
+        )
+    except OSError:
+        plain = True
+    return os.path.join(real, entry.name) if plain else os.path.realpath(child)
+
+
+def _select(
+    path: str,
+    real: str,
+    parts: Sequence[str],
+    dir_only: bool,
+    list_dir: ListDir,
+    entries: Optional[Sequence[DirEntryLike]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (path, real path) pairs below path matching parts (one glob segment
+    per item). real is the real path of path itself.
+    """
+    part, rest = parts[0], parts[1:]
+
+    if part == "**":
+        # Zero or more directories: path itself, then every non-hidden subdir.
+        # A plain subdirectory's real path is its parent's plus its name, so
+        # only symlinks need os.path.realpath.
+        stack: List[_WalkItem] = [(path, entries, real)]
+        seen = {real}
+        while stack:
+            current, listing, current_real = stack.pop()
+            if listing is None:
+                listing = list_dir(current)
+            if rest:
+                yield from _select(
+                    current, current_real, rest, dir_only, list_dir, listing
+                )
+            elif current:
+                # Like glob, the zero-directory match keeps a trailing separator
+                match = os.path.join(current, "") if current == path else current
+                yield match, current_real
+            subdirs: List[_WalkItem] = []
+            for entry in listing:
+                if entry.name.startswith("."):
+                    continue
+                child = _join(current, entry.name)
+                if _is_dir(entry, follow_symlinks=False):
+                    child_real = os.path.join(current_real, entry.name)
+                elif _is_dir(entry):
+                    child_real = os.path.realpath(child)
+                    if child_real in seen:
+                        continue
+                else:
+                    if not rest and not dir_only:
+                        yield child, _real_child(entry, child, current_real)
+                    continue
+                seen.add(child_real)
+                subdirs.append((child, None, child_real))
+            stack.extend(reversed(subdirs))
+        return
+
+    if has_magic(part):
+        regex = _compile_segment(part)
+        show_hidden = part.startswith(".")
+        for entry in entries if entries is not None else list_dir(path):
+            if entry.name.startswith(".") and not show_hidden:
+                continue
+            if not regex.match(entry.name):
+                continue
+            if rest:
+                if _is_dir(entry):
+                    child = _join(path, entry.name)
+                    yield from _select(
+                        child,
+                        _real_child(entry, child, real),
+                        rest,
+                        dir_only,
+                        list_dir,
+                    )
+            elif not dir_only or _is_dir(entry):
+                child = _join(path, entry.name)
+                yield child, _real_child(entry, child, real)
+        return
+
+    # Literal segment: join without listing; a symlink costs one lstat
+    child = _join(path, part)
+    child_real = (
+        os.path.realpath(child) if os.path.islink(child) else os.path.join(real, part)
+    )
+    if rest:
+        yield from _select(child, child_real, rest, dir_only, list_dir)
+    elif os.path.isdir(child) if dir_only else os.path.lexists(child):
+        yield child, child_real
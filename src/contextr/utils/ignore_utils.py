@@ -2,8 +2,16 @@ import os
 import platform
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Pattern, Set
+from typing import FrozenSet, List, Optional, Pattern, Set, Tuple
+
+from .glob_utils import has_magic
+from .path_utils import strip_base_prefix
+
+_REGEX_FLAGS = (
+    re.IGNORECASE if (os.name == "nt" or platform.system() == "Darwin") else 0
+)
 
 
 @dataclass
@@ -13,6 +21,89 @@ class _Rule:
     regex: Pattern[str] | None = None
 
 
+def _literal_form(pattern: str) -> Tuple[str, str]:
+    """
+    Classify a rule that can be checked without its regex.
+
+    An unanchored rule without wildcards or inner slashes ('__pycache__',
+    'build/') matches any path segment with that exact name; '*.ext' with a
+    literal extension matches any segment ending in it.
+
+    Returns:
+        Tuple[str, str]: ("name", name), ("suffix", suffix) or ("", "")
+    """
+    pattern = pattern.strip()
+    if pattern.endswith("/"):
+        pattern = pattern[:-1]
+    if not pattern or "/" in pattern or "\\" in pattern:
+        return "", ""
+    if not has_magic(pattern):
+        return "name", pattern
+    if pattern.startswith("*") and len(pattern) > 1 and not has_magic(pattern[1:]):
+        return "suffix", pattern[1:]
+    return "", ""
+
+
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str) -> Pattern[str]:
+    """
+    Convert a gitignore-style pattern to a regex with segment-aware semantics.
+    Results are cached, so re-adding or re-loading rules does not recompile.
+    Highlights:
+      - Leading '/' anchors to repo root.
+      - Trailing '/' indicates a directory rule, but even without it a segment
+        match implies directory descendants are ignored (git behavior).
+      - '**/' matches ZERO or more directories.
+      - '*' matches within a path segment only (no '/').
+      - '?' matches a single non-'/' character.
+      - Last match wins is handled at evaluation time, not here.
+    """
+    # Normalize and strip
+    pattern = pattern.strip().replace("\\", "/")
+
+    dir_only = pattern.endswith("/")
+    if dir_only:
+        pattern = pattern[:-1]
+
+    # Leading slash anchors to root (relative to base_dir)
+    anchored = pattern.startswith("/")
+    if anchored:
+        pattern = pattern[1:]
+
+    # Escape regex specials first
+    escaped = re.escape(pattern)
+
+    # Reintroduce git-style globs.
+    #
+    # IMPORTANT: '**/' must allow ZERO directories. The previous implementation
+    # used '.*?/', which forced at least one dir and broke patterns like a/**/b
+    # (which should match a/b). We use a non-capturing optional group.
+    # re.escape leaves '/' alone, so the escaped form of '**/' is '\*\*/'.
+    pattern_regex = (
+        escaped.replace(r"\*\*/", r"(?:.*/)?")  # **/  -> zero or more directories
+        .replace(r"\*\*", r".*")  # **   -> any chars, including '/'
+        .replace(r"\*", r"[^/]*")  # *    -> any chars except '/'
+        .replace(r"\?", r"[^/]")  # ?    -> single non-'/' char
+    )
+
+    # Segment-aware anchoring:
+    # - anchored: must match starting at beginning of relpath
+    # - not anchored: allow a segment start boundary anywhere
+    prefix = r"^" if anchored else r"(^|/)"
+
+    # Suffix:
+    # Git treats a directory-name match (with or without a trailing slash)
+    # as affecting everything inside. Using '(/|$)' here ensures both:
+    #  - exact leaf matches (files or dirs), AND
+    #  - segment matches inside a longer path (…/dir/…).
+    # This gives correct behavior for bare names like 'node_modules'.
+    suffix = r"(/|$)"
+
+    full = f"{prefix}{pattern_regex}{suffix}"
+
+    return re.compile(full, _REGEX_FLAGS)
+
+
 class IgnoreManager:
     """
     Manages ignore patterns with git-style pattern semantics.
@@ -30,86 +121,79 @@ class IgnoreManager:
         self.ignore_file = base_dir / ".contextr" / ".ignore"
         # Ordered list of rules; preserves file order (git-like)
         self._rules: List[_Rule] = []
+        # Union of the rule regexes not covered by the literal sets below;
+        # a miss (and no literal hit) means no rule can apply
+        self._combined: Optional[Pattern[str]] = None
+        # Without negations, literal rules are checked by set lookup per segment
+        self._has_negations = False
+        self._literal_names: FrozenSet[str] = frozenset()
+        self._literal_suffixes: Tuple[str, ...] = ()
         self._load_patterns()
 
+    @property
+    def base_dir(self) -> Path:
+        """Directory that rules are matched relative to."""
+        return self._base_dir
+
+    @base_dir.setter
+    def base_dir(self, value: Path) -> None:
+        self._base_dir = value
+        self._base_prefix = os.path.join(str(value.resolve()), "")
+
     def _load_patterns(self) -> None:
         """Load rules from .ignore in order and compile them."""
         self._rules.clear()
         if self.ignore_file.exists():
-            with open(self.ignore_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    is_neg = line.startswith("!")
-                    raw = line[1:] if is_neg else line
-                    self._rules.append(_Rule(raw=raw, is_negation=is_neg))
+            # One read and decode for the whole file, then split in C
+            text = self.ignore_file.read_text(encoding="utf-8")
+            for line in text.split("\n"):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                is_neg = line.startswith("!")
+                raw = line[1:] if is_neg else line
+                self._rules.append(_Rule(raw=raw, is_negation=is_neg))
         self.compile_patterns()
 
     def compile_patterns(self) -> None:
-        """Compile all rules into regex for efficient matching."""
+        """
+        Compile all rules into regex for efficient matching.
+
+        While no negation rules exist, the first matching rule decides, so
+        literal names and '*.ext' rules are split off into plain sets and only
+        the remaining rules go into the combined regex.
+        """
         for r in self._rules:
             r.regex = self._pattern_to_regex(r.raw)
+        self._has_negations = any(r.is_negation for r in self._rules)
 
-    def _pattern_to_regex(self, pattern: str) -> Pattern[str]:
-        """
-        Convert a gitignore-style pattern to a regex with segment-aware semantics.
-        Highlights:
-          - Leading '/' anchors to repo root.
-          - Trailing '/' indicates a directory rule, but even without it a segment
-            match implies directory descendants are ignored (git behavior).
-          - '**/' matches ZERO or more directories.
-          - '*' matches within a path segment only (no '/').
-          - '?' matches a single non-'/' character.
-          - Last match wins is handled at evaluation time, not here.
-        """
-        # Normalize and strip
-        pattern = pattern.strip().replace("\\", "/")
-
-        dir_only = pattern.endswith("/")
-        if dir_only:
-            pattern = pattern[:-1]
-
-        # Leading slash anchors to root (relative to base_dir)
-        anchored = pattern.startswith("/")
-        if anchored:
-            pattern = pattern[1:]
-
-        # Escape regex specials first
-        escaped = re.escape(pattern)
-
-        # Reintroduce git-style globs.
-        #
-        # IMPORTANT: '**/' must allow ZERO directories. The previous implementation
-        # used '.*?/', which forced at least one dir and broke patterns like a/**/b
-        # (which should match a/b). We use a non-capturing optional group.
-        pattern_regex = (
-            escaped.replace(r"\*\*\/", r"(?:.*/)?")  # **/  -> zero or more directories
-            .replace(r"\*\*", r".*")  # **   -> any chars, including '/'
-            .replace(r"\*", r"[^/]*")  # *    -> any chars except '/'
-            .replace(r"\?", r"[^/]")  # ?    -> single non-'/' char
+        names: Set[str] = set()
+        suffixes: Set[str] = set()
+        general: List[_Rule] = []
+        for r in self._rules:
+            kind, literal = ("", "") if self._has_negations else _literal_form(r.raw)
+            if _REGEX_FLAGS:
+                literal = literal.lower()
+            if kind == "name":
+                names.add(literal)
+            elif kind == "suffix":
+                suffixes.add(literal)
+            else:
+                general.append(r)
+        self._literal_names = frozenset(names)
+        self._literal_suffixes = tuple(sorted(suffixes))
+        self._combined = (
+            re.compile(
+                "|".join(f"(?:{r.regex.pattern})" for r in general if r.regex),
+                _REGEX_FLAGS,
+            )
+            if general
+            else None
         )
 
-        # Segment-aware anchoring:
-        # - anchored: must match starting at beginning of relpath
-        # - not anchored: allow a segment start boundary anywhere
-        prefix = r"^" if anchored else r"(^|/)"
-
-        # Suffix:
-        # Git treats a directory-name match (with or without a trailing slash)
-        # as affecting everything inside. Using '(/|$)' here ensures both:
-        #  - exact leaf matches (files or dirs), AND
-        #  - segment matches inside a longer path (…/dir/…).
-        # This gives correct behavior for bare names like 'node_modules'.
-        suffix = r"(/|$)"
-
-        full = f"{prefix}{pattern_regex}{suffix}"
-
-        # Compile the regex with proper flags
-        return re.compile(
-            full,
-            re.IGNORECASE if (os.name == "nt" or platform.system() == "Darwin") else 0,
-        )
+    def _pattern_to_regex(self, pattern: str) -> Pattern[str]:
+        """Return the (cached) compiled regex for a gitignore-style pattern."""
+        return _compile_pattern(pattern)
 
     def should_ignore(self, path: str) -> bool:
         """
@@ -122,31 +206,105 @@ class IgnoreManager:
         Returns:
             bool: True if path should be ignored
         """
-        try:
-            rel_path = str(Path(path).resolve().relative_to(self.base_dir.resolve()))
-            rel_path = rel_path.replace("\\", "/")
-        except (ValueError, OSError):
+        # Paths found by walking base_dir only need their prefix sliced off
+        rel_path = strip_base_prefix(path, self._base_prefix)
+        if not rel_path:
+            try:
+                rel_path = str(Path(path).resolve().relative_to(self._base_prefix))
+            except (ValueError, OSError):
+                return False
+        return self.should_ignore_relative(rel_path.replace("\\", "/"))
+
+    def should_ignore_relative(self, rel_path: str) -> bool:
+        """
+        Check a path already relative to base_dir ('/'-separated).
+
+        Args:
+            rel_path: Path relative to base_dir
+
+        Returns:
+            bool: True if path should be ignored
+        """
+        if self._literal_names or self._literal_suffixes:
+            names = self._literal_names
+            suffixes = self._literal_suffixes
+            parts = rel_path.lower() if _REGEX_FLAGS else rel_path
+            for part in parts.split("/"):
+                if part in names or (suffixes and part.endswith(suffixes)):
+                    return True
+
+        # One pass over the union rejects paths no rule touches
+        if self._combined is None or not self._combined.search(rel_path):
             return False
+        if not self._has_negations:
+            return True
 
-        ignored = False
-        for r in self._rules:
+        # Last match wins: scan from the end and stop at the first hit
+        for r in reversed(self._rules):
             assert r.regex is not None
             if r.regex.search(rel_path):
-                ignored = not r.is_negation
-        return ignored
+                return not r.is_negation
+        return False
 
-    def add_pattern(self, pattern: str) -> None:
+    def is_redundant(self, pattern: str) -> bool:
         """
-        Append a new pattern (preserving order). Accepts negations with leading '!'.
+        Check whether adding a pattern could not ignore anything new.
+
+        Only literal (wildcard-free) positive patterns are considered, and only
+        while no negation rules exist. Since every rule also covers directory
+        descendants, the new pattern is redundant when an existing rule already
+        matches its path - at any depth unless the new pattern is anchored, in
+        which case the existing rule must be unanchored or match at the root.
+
+        Args:
+            pattern: Pattern about to be added
+
+        Returns:
+            bool: True if the pattern is already covered by existing rules
         """
         pattern = pattern.strip()
         if not pattern:
+            return True
+        if pattern.startswith("!") or any(r.is_negation for r in self._rules):
+            return False
+        path = pattern.replace("\\", "/")
+        if has_magic(path):
+            return False
+        anchored = path.startswith("/")
+        path = path.strip("/")
+        for r in self._rules:
+            assert r.regex is not None
+            # An unanchored rule matching the path also matches it under any
+            # parent, since its '(^|/)' prefix then matches the separator
+            if (anchored or not r.raw.startswith("/")) and r.regex.search(path):
+                return True
+        return False
+
+    def add_pattern(self, pattern: str) -> None:
+        """
+        Append a new pattern (preserving order). Accepts negations with leading '!'.
+        """
+        self.add_patterns([pattern])
+
+    def add_patterns(self, patterns: List[str]) -> None:
+        """
+        Append several patterns in order, then recompile and save .ignore once.
+        Blank patterns and exact duplicates of existing rules are skipped; if
+        nothing is left, .ignore is not rewritten.
+        """
+        before = len(self._rules)
+        present = {(r.raw, r.is_negation) for r in self._rules}
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern:
+                continue
+            is_neg = pattern.startswith("!")
+            raw = pattern[1:] if is_neg else pattern
+            if (raw, is_neg) not in present:
+                present.add((raw, is_neg))
+                self._rules.append(_Rule(raw=raw, is_negation=is_neg))
+        if len(self._rules) == before:
             return
-        is_neg = pattern.startswith("!")
-        raw = pattern[1:] if is_neg else pattern
-        # Avoid exact duplicate rules
-        if not any((r.raw == raw and r.is_negation == is_neg) for r in self._rules):
-            self._rules.append(_Rule(raw=raw, is_negation=is_neg))
         self.compile_patterns()
         self.save_patterns()
 
@@ -172,10 +330,9 @@ class IgnoreManager:
     def save_patterns(self) -> None:
         """Write rules to .ignore preserving order."""
         self.ignore_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.ignore_file, "w", encoding="utf-8") as f:
-            for r in self._rules:
-                prefix = "!" if r.is_negation else ""
-                f.write(f"{prefix}{r.raw}\n")
+        self.ignore_file.write_text(
+            "".join(f"{line}\n" for line in self.list_patterns()), encoding="utf-8"
+        )
 
     def list_patterns(self) -> List[str]:
         """Return patterns in current file order (negations prefixed with '!')."""
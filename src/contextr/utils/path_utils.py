@@ -1,12 +1,15 @@
-import glob
 import os
 import platform
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
 from rich.console import Console
 
-from .ignore_utils import IgnoreManager
+from .dir_cache import DirEntryLike, ListDir, scan_dir
+from .glob_utils import expand_glob, has_magic
+
+if TYPE_CHECKING:
+    from .ignore_utils import IgnoreManager
 
 console = Console()
 
@@ -51,6 +54,25 @@ def make_relative(path: str, base_dir: Path) -> str:
         return str(Path(path).resolve())
 
 
+def strip_base_prefix(path: str, base_prefix: str) -> Optional[str]:
+    """
+    Make a path relative by slicing off its base directory prefix.
+    Unlike make_relative this does not resolve symlinks or touch the
+    filesystem, so callers fall back to make_relative when it returns None.
+
+    Args:
+        path: Absolute path
+        base_prefix: Base directory followed by a separator (e.g. "/repo/")
+
+    Returns:
+        Optional[str]: The relative path, or None if path is not a normalized
+        path below base_prefix
+    """
+    if path.startswith(base_prefix) and os.path.normpath(path) == path:
+        return path[len(base_prefix) :]
+    return None
+
+
 def make_absolute(path: str, base_dir: Path) -> str:
     """
     Convert relative path to absolute path from base_dir.
@@ -83,8 +105,45 @@ def make_absolute(path: str, base_dir: Path) -> str:
     return str((base_dir / path).resolve())
 
 
+def scandir_recursive(
+    root: str, list_dir: ListDir = scan_dir
+) -> Iterator[DirEntryLike]:
+    """
+    Recursively yield file entries below root using os.scandir.
+    DirEntry caches the file type reported by the directory listing, so no
+    extra stat() call is needed per entry (unlike Path.rglob + is_file).
+
+    Directory symlinks are not followed to avoid cycles; symlinked files are
+    yielded. Unreadable directories are skipped.
+
+    Args:
+        root: Directory to walk
+        list_dir: Directory listing function (e.g. a DirListingCache's list_dir)
+
+    Returns:
+        Iterator[DirEntryLike]: File entries (entry.path is joined onto root)
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        subdirs: List[str] = []
+        for entry in list_dir(current):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+            except OSError:
+                continue
+        # Reverse so directories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+
 def normalize_paths(
-    patterns: List[str], base_dir: Path, ignore_manager: Optional[IgnoreManager] = None
+    patterns: List[str],
+    base_dir: Path,
+    ignore_manager: Optional["IgnoreManager"] = None,
+    list_dir: ListDir = scan_dir,
 ) -> List[str]:
     """
     Normalize and expand glob patterns to absolute paths, respecting ignore patterns.
@@ -94,6 +153,7 @@ def normalize_paths(
         patterns: List of file patterns (can include globs)
         base_dir: The base directory to resolve relative paths against
         ignore_manager: Optional IgnoreManager to filter ignored files
+        list_dir: Directory listing function used for glob expansion
 
     Returns:
         List[str]: List of normalized absolute paths
@@ -107,9 +167,10 @@ def normalize_paths(
         abs_pattern = make_absolute(expanded_pattern, base_dir)
 
         # Handle glob patterns
-        if glob.has_magic(expanded_pattern):
+        if has_magic(expanded_pattern):
             try:
-                matched_files = glob.glob(abs_pattern, recursive=True)
+                # Real paths, so ignore rules see a link's target (as for walks)
+                matched_files = expand_glob(abs_pattern, list_dir, resolve_links=True)
 
                 if matched_files:
                     # Filter out ignored files if ignore_manager is provided
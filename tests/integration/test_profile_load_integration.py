@@ -1,9 +1,8 @@
 """Integration tests for profile loading functionality."""
 
 import os
-import tempfile
 from pathlib import Path
-from typing import Generator
+from typing import List
 
 import pytest
 
@@ -12,24 +11,25 @@ from contextr.profile import ProfileManager, ProfileNotFoundError
 from contextr.storage import JsonStorage
 
 
+def make_files(root: Path, rel_paths: List[str]) -> None:
+    """Create empty files below root, making each parent directory once."""
+    for parent in {os.path.dirname(p) for p in rel_paths}:
+        os.makedirs(root / parent, exist_ok=True)
+    for rel in rel_paths:
+        os.close(os.open(root / rel, os.O_CREAT | os.O_WRONLY, 0o644))
+
+
 @pytest.fixture
-def temp_dir() -> Generator[Path, None, None]:
-    """Create a temporary directory for tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_dir(tmp_path: Path) -> Path:
+    """Project directory for a test."""
+    return tmp_path
 
 
 @pytest.fixture
 def context_manager(temp_dir: Path) -> ContextManager:
-    """Create a ContextManager with real storage."""
+    """Create a ContextManager with real storage rooted at temp_dir."""
     storage = JsonStorage(temp_dir / ".contextr")
-    # Change to temp directory for tests
-    original_cwd = os.getcwd()
-    os.chdir(temp_dir)
-    manager = ContextManager(storage=storage)
-    yield manager
-    # Restore original directory
-    os.chdir(original_cwd)
+    return ContextManager(storage=storage, base_dir=temp_dir)
 
 
 @pytest.fixture
@@ -51,16 +51,7 @@ class TestProfileLoadIntegration:
     ) -> None:
         """Test complete workflow: save profile, clear context, load profile."""
         # Create test files
-        src_dir = temp_dir / "src"
-        src_dir.mkdir()
-        test_files = [
-            src_dir / "main.py",
-            src_dir / "utils.py",
-            temp_dir / "README.md",
-            temp_dir / "test.txt",
-        ]
-        for f in test_files:
-            f.touch()
+        make_files(temp_dir, ["src/main.py", "src/utils.py", "README.md", "test.txt"])
 
         # Set up initial context
         context_manager.watch_paths(["src/*.py", "*.md"])
@@ -110,9 +101,7 @@ class TestProfileLoadIntegration:
     ) -> None:
         """Test that different profiles maintain separate contexts."""
         # Create test files
-        (temp_dir / "frontend.js").touch()
-        (temp_dir / "backend.py").touch()
-        (temp_dir / "styles.css").touch()
+        make_files(temp_dir, ["frontend.js", "backend.py", "styles.css"])
 
         # Create and save frontend profile
         context_manager.watch_paths(["*.js", "*.css"])
@@ -153,28 +142,20 @@ class TestProfileLoadIntegration:
         temp_dir: Path,
     ) -> None:
         """Test profile with complex glob patterns."""
-        # Create nested directory structure
-        src_dir = temp_dir / "src"
-        src_py_dir = src_dir / "python"
-        src_js_dir = src_dir / "javascript"
-        test_dir = temp_dir / "tests"
-
-        for d in [src_py_dir, src_js_dir, test_dir]:
-            d.mkdir(parents=True)
-
-        # Create files
-        files = [
-            src_py_dir / "main.py",
-            src_py_dir / "utils.py",
-            src_js_dir / "app.js",
-            src_js_dir / "helpers.js",
-            test_dir / "test_main.py",
-            test_dir / "test_utils.py",
-            temp_dir / "README.md",
-            temp_dir / "setup.py",
-        ]
-        for f in files:
-            f.touch()
+        # Create nested directory structure and files
+        make_files(
+            temp_dir,
+            [
+                "src/python/main.py",
+                "src/python/utils.py",
+                "src/javascript/app.js",
+                "src/javascript/helpers.js",
+                "tests/test_main.py",
+                "tests/test_utils.py",
+                "README.md",
+                "setup.py",
+            ],
+        )
 
         # Set up complex patterns
         patterns = [
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+import pytest
+
 from contextr.manager import ContextManager
 from contextr.storage.json_storage import JsonStorage
 
@@ -115,3 +117,198 @@ def test_watch_patterns_not_filtered(tmp_path: Path):
     # File is ignored, but pattern is still watched
     assert len(cm.files) == 0
     assert "src/**/*.py" in cm.list_watched()
+
+
+def test_add_positive_ignore_filters_without_rescan(tmp_path: Path, monkeypatch):
+    os.chdir(tmp_path)
+    state_dir = tmp_path / ".contextr"
+    cm = ContextManager(storage=JsonStorage(state_dir))
+    touch(tmp_path / "src" / "a.py")
+    touch(tmp_path / "src" / "gen" / "b.py")
+    touch(tmp_path / "src" / "gen" / "c.py")
+    cm.watch_paths(["src/**/*.py"])
+    assert len(cm.files) == 3
+
+    def fail_refresh():
+        raise AssertionError("positive ignore rules should not rescan")
+
+    monkeypatch.setattr(cm, "refresh_watched", fail_refresh)
+    removed, dirs = cm.add_ignore_patterns(["gen/"])
+    assert (removed, dirs) == (2, 1)
+    normalized_paths = [p.replace("\\", "/") for p in cm.get_file_paths()]
+    assert normalized_paths == ["src/a.py"]
+
+
+def test_add_negation_keeps_files_outside_watched_paths(tmp_path: Path):
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"), base_dir=tmp_path)
+    touch(tmp_path / "src" / "a.py")
+    touch(tmp_path / "src" / "gen" / "b.py")
+    touch(tmp_path / "notes.md")
+    cm.add_ignore_patterns(["gen/"])
+    cm.watch_paths(["src/**/*.py"])
+    cm._add_files(["notes.md"])  # type: ignore[reportPrivateUsage]
+
+    # Like a positive rule, a negation leaves unwatched files in place
+    assert cm.add_ignore_patterns(["!src/gen/b.py"]) == (0, 0)
+    normalized_paths = sorted(p.replace("\\", "/") for p in cm.get_file_paths())
+    assert normalized_paths == ["notes.md", "src/a.py", "src/gen/b.py"]
+
+    # Both kinds of rule filter the context in memory
+    assert cm.add_ignore_patterns(["notes.md", "!src/a.py"]) == (1, 1)
+    normalized_paths = sorted(p.replace("\\", "/") for p in cm.get_file_paths())
+    assert normalized_paths == ["src/a.py", "src/gen/b.py"]
+
+
+def test_add_covered_ignore_pattern_skips_filtering(tmp_path: Path, monkeypatch):
+    os.chdir(tmp_path)
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"))
+    touch(tmp_path / "src" / "a.py")
+    cm.watch_paths(["src/**/*.py"])
+    cm.add_ignore_patterns(["*.log"])
+
+    def fail_should_ignore(path: str) -> bool:
+        raise AssertionError("covered patterns should not re-check files")
+
+    monkeypatch.setattr(cm.ignore_manager, "should_ignore", fail_should_ignore)
+    assert cm.add_ignore_patterns(["logs/debug.log"]) == (0, 0)
+    assert "logs/debug.log" in cm.list_ignore_patterns()
+
+
+def test_watch_does_not_descend_into_ignored_dirs(tmp_path: Path, monkeypatch):
+    os.chdir(tmp_path)
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"))
+    touch(tmp_path / "src" / "a.py")
+    touch(tmp_path / "src" / "a.md")
+    touch(tmp_path / "node_modules" / "pkg" / "index.py")
+    cm.add_ignore_patterns(["node_modules"])
+
+    listed: list[str] = []
+    list_dir = cm.dir_cache.list_dir
+
+    def spy(path: str):
+        listed.append(path)
+        return list_dir(path)
+
+    monkeypatch.setattr(cm.dir_cache, "list_dir", spy)
+    cm.watch_paths(["**/*.py", "**/*.md"])
+    assert cm.refresh_watched() == {"added": 2, "removed": 0}
+    assert not any("node_modules" in p for p in listed)
+    # Both patterns share one listing per directory in each of the two passes
+    assert all(listed.count(p) == 2 for p in listed)
+
+
+def test_search_files_is_case_insensitive(tmp_path: Path):
+    os.chdir(tmp_path)
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"))
+    touch(tmp_path / "src" / "Parser.py")
+    touch(tmp_path / "src" / "lexer.py")
+    cm.watch_paths(["src/*.py"])
+
+    expected = [os.path.join("src", "Parser.py")]
+    assert cm.search_files("PARSER") == expected
+    assert cm.search_files("parser") == expected
+    cm.clear_context()
+    assert cm.search_files("parser") == []
+
+
+def test_remove_directory_drops_files_by_prefix(tmp_path: Path):
+    os.chdir(tmp_path)
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"))
+    touch(tmp_path / "src" / "a.py")
+    touch(tmp_path / "src" / "pkg" / "b.py")
+    touch(tmp_path / "src_extra" / "c.py")
+    cm.watch_paths(["src/**/*.py", "src_extra/*.py"])
+    (tmp_path / "src" / "pkg" / "b.py").unlink()  # stale entries go too
+
+    assert cm._remove_files(["src"]) == 2
+    normalized_paths = [p.replace("\\", "/") for p in cm.get_file_paths()]
+    assert normalized_paths == ["src_extra/c.py"]
+
+
+def test_remove_several_directories_in_one_pass(tmp_path: Path):
+    os.chdir(tmp_path)
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"))
+    for d in ["pkg_a", "pkg_b", "pkg_c"]:
+        touch(tmp_path / d / "mod.py")
+        touch(tmp_path / d / "sub" / "mod.py")
+    touch(tmp_path / "main.py")
+    cm.watch_paths(["**/*.py"])
+
+    assert cm._remove_files(["pkg_*", "main.py"]) == 7
+    assert cm.files == set()
+
+
+def test_add_several_directories(tmp_path: Path):
+    os.chdir(tmp_path)
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"))
+    for d in ["src", "tests", "docs"]:
+        touch(tmp_path / d / "a.py")
+        touch(tmp_path / d / "sub" / "b.py")
+        touch(tmp_path / d / "b.log")
+    cm.add_ignore_patterns(["*.log"])
+
+    assert cm._add_files(["src", "tests", "docs"]) == 6
+    assert cm._add_files(["src", "tests"]) == 0
+    assert len(cm.files) == 6
+    assert not any(f.endswith(".log") for f in cm.files)
+
+
+def test_sync_gitignore_skips_comments(tmp_path: Path):
+    os.chdir(tmp_path)
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"))
+    (tmp_path / ".gitignore").write_bytes(
+        b"# build output\r\ndist/  # generated\r\n\r\n*.pyc\r\n"
+    )
+
+    assert cm.sync_gitignore() == (2, ["dist/", "*.pyc"])
+    assert cm.sync_gitignore() == (0, [])
+
+
+def test_symlinks_follow_ignore_rules_of_their_target(tmp_path: Path):
+    touch(tmp_path / "node_modules" / "x" / "index.js")
+    touch(tmp_path / "src" / "real.py")
+    try:
+        (tmp_path / "vendor").symlink_to(tmp_path / "node_modules" / "x")
+        (tmp_path / "src" / "link.js").symlink_to(
+            tmp_path / "node_modules" / "x" / "index.js"
+        )
+        (tmp_path / "alias.py").symlink_to(tmp_path / "src" / "real.py")
+    except OSError:
+        pytest.skip("Symlinks not supported on this system")
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"), base_dir=tmp_path)
+    cm.add_ignore_patterns(["node_modules/", ".contextr/"])
+
+    # A linked root and a linked file resolve into the ignored directory
+    cm.watch_paths(["vendor", "src"])
+    assert cm.files == {str(tmp_path / "src" / "real.py")}
+
+    # A link to a kept file is stored by its target
+    cm.watch_paths(["."])
+    assert cm.files == {str(tmp_path / "src" / "real.py")}
+
+
+def test_glob_matches_are_resolved_like_walked_files(tmp_path: Path):
+    touch(tmp_path / "node_modules" / "x" / "index.js")
+    touch(tmp_path / "shared" / "lib" / "u.py")
+    touch(tmp_path / "app" / "m.py")
+    try:
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "dep.js").symlink_to(
+            tmp_path / "node_modules" / "x" / "index.js"
+        )
+        (tmp_path / "app" / "lib").symlink_to(tmp_path / "shared" / "lib")
+    except OSError:
+        pytest.skip("Symlinks not supported on this system")
+    cm = ContextManager(storage=JsonStorage(tmp_path / ".contextr"), base_dir=tmp_path)
+    cm.add_ignore_pattern("node_modules/")
+
+    # A matched link into an ignored directory is ignored
+    assert cm.watch_paths(["src/*.js"]) == (1, 0)
+
+    # Files reached through a linked directory are stored by their target,
+    # the same path a walk of app/ records
+    cm.watch_paths(["app/*/*.py", "app/**/*.py"])
+    assert cm.files == {
+        str(tmp_path / "app" / "m.py"),
+        str(tmp_path / "shared" / "lib" / "u.py"),
+    }
@@ -6,19 +6,20 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 from typer.testing import CliRunner
 
-from contextr.cli import app
+from contextr.cli import app, get_context_manager
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def runner():
-    """Create a CLI runner for testing."""
+    """CLI runner shared by all tests; invoke() isolates each run itself."""
     return CliRunner()
 
 
 @pytest.fixture
 def mock_context_manager():
     """Mock the global context manager."""
-    with patch("contextr.cli.context_manager") as mock_cm:
+    with patch("contextr.cli.get_context_manager") as mock_get_cm:
+        mock_cm = mock_get_cm.return_value
         mock_cm.base_dir = Path("/test/dir")
         mock_cm.current_profile_name = None
         mock_cm.is_dirty = False
@@ -28,97 +29,174 @@ def mock_context_manager():
         yield mock_cm
 
 
+@pytest.fixture
+def path_exists():
+    """Patch Path.exists; tests set return_value."""
+    with patch.object(Path, "exists") as mock_exists:
+        yield mock_exists
+
+
+@pytest.fixture
+def mock_profile_manager():
+    """Patch the CLI's ProfileManager and return its instance mock."""
+    with patch("contextr.cli.ProfileManager") as MockPM:
+        MockPM.return_value.save_profile.return_value = True
+        yield MockPM.return_value
+
+
 class TestGisCommand:
     """Test the gis command and its backward compatibility alias."""
 
-    def test_gis_command_success(self, runner, mock_context_manager):
-        """Test successful gitignore sync with gis command."""
-        # Setup mocks
+    @pytest.mark.parametrize(
+        ("command", "exists", "sync_return", "patterns", "expected"),
+        [
+            pytest.param(
+                "gis",
+                True,
+                (3, ["*.log", "*.tmp", "*.cache"]),
+                [],
+                [
+                    "Added 3 new patterns from .gitignore:",
+                    "+ *.log",
+                    "+ *.tmp",
+                    "+ *.cache",
+                    "Total ignore patterns now:",
+                ],
+                id="success",
+            ),
+            pytest.param(
+                "gis",
+                False,
+                None,
+                [],
+                ["No .gitignore file found in current directory!"],
+                id="no-gitignore",
+            ),
+            pytest.param(
+                "gis",
+                True,
+                (0, []),
+                ["*.log", "*.tmp"],
+                [
+                    "No new patterns to sync from .gitignore",
+                    "All patterns already in ignore list",
+                    "(2 total)",
+                ],
+                id="no-new-patterns",
+            ),
+            # gitignore-sync is the hidden backward-compatible alias
+            pytest.param(
+                "gitignore-sync",
+                True,
+                (2, ["*.bak", "temp/"]),
+                [],
+                ["Added 2 new patterns from .gitignore:", "*.bak", "temp/"],
+                id="gitignore-sync-alias",
+            ),
+        ],
+    )
+    def test_gis_command(
+        self,
+        runner,
+        mock_context_manager,
+        path_exists,
+        command,
+        exists,
+        sync_return,
+        patterns,
+        expected,
+    ):
+        """Test gitignore sync outcomes for gis and its alias."""
         mock_context_manager.base_dir = Path("/test/dir")
+        path_exists.return_value = exists
+        mock_context_manager.sync_gitignore.return_value = sync_return
+        mock_context_manager.list_ignore_patterns.return_value = patterns
 
-        with patch.object(Path, "exists") as mock_exists:
-            mock_exists.return_value = True
-            mock_context_manager.sync_gitignore.return_value = (
-                3,
-                ["*.log", "*.tmp", "*.cache"],
-            )
-
-            # Run command
-            result = runner.invoke(app, ["gis"])
-
-            # Verify
-            assert result.exit_code == 0
-            assert "Added 3 new patterns from .gitignore:" in result.stdout
-            assert "+ *.log" in result.stdout
-            assert "+ *.tmp" in result.stdout
-            assert "+ *.cache" in result.stdout
-            assert "Total ignore patterns now:" in result.stdout
+        result = runner.invoke(app, [command])
+
+        assert result.exit_code == 0
+        for text in expected:
+            assert text in result.stdout
+        if exists:
             mock_context_manager.sync_gitignore.assert_called_once()
+        else:
+            mock_context_manager.sync_gitignore.assert_not_called()
 
-    def test_gis_command_no_gitignore(self, runner, mock_context_manager):
-        """Test gis command when no .gitignore file exists."""
-        # Setup mocks
-        mock_context_manager.base_dir = Path("/test/dir")
+    def test_gis_not_shown_in_help_gitignore_sync_hidden(self, runner):
+        """Test that gis is shown in help but gitignore-sync is hidden."""
+        # Get main help
+        result = runner.invoke(app, ["--help"])
 
-        with patch.object(Path, "exists") as mock_exists:
-            mock_exists.return_value = False
+        # Verify gis is shown and gitignore-sync is not
+        assert "gis" in result.stdout
+        assert "gitignore-sync" not in result.stdout
+        assert result.exit_code == 0
 
-            # Run command
-            result = runner.invoke(app, ["gis"])
 
-            # Verify
-            assert result.exit_code == 0
-            assert "No .gitignore file found in current directory!" in result.stdout
-            mock_context_manager.sync_gitignore.assert_not_called()
+class TestTreeOutput:
+    """Test when and how the context tree is rendered."""
 
-    def test_gis_command_no_new_patterns(self, runner, mock_context_manager):
-        """Test gis command when no new patterns to sync."""
-        # Setup mocks
-        mock_context_manager.base_dir = Path("/test/dir")
+    def test_watch_prints_count_unless_tree_requested(
+        self, runner, mock_context_manager
+    ):
+        """Test watch only summarizes the context by default."""
+        files = {"/test/dir/src/a.py", "/test/dir/src/b.py"}
+        mock_context_manager.files = files
+        mock_context_manager.relative_paths.return_value = {
+            f: f.removeprefix("/test/dir/") for f in files
+        }
+        mock_context_manager.watch_paths.return_value = (1, 2)
 
-        with patch.object(Path, "exists") as mock_exists:
-            mock_exists.return_value = True
-            mock_context_manager.sync_gitignore.return_value = (0, [])
-            mock_context_manager.list_ignore_patterns.return_value = ["*.log", "*.tmp"]
+        result = runner.invoke(app, ["watch", "src/*.py"])
+        assert result.exit_code == 0
+        assert "2 files in context" in result.stdout
+        assert "a.py" not in result.stdout
 
-            # Run command
-            result = runner.invoke(app, ["gis"])
+        result = runner.invoke(app, ["watch", "src/*.py", "--show-tree"])
+        assert result.exit_code == 0
+        assert "📄 a.py" in result.stdout
 
-            # Verify
-            assert result.exit_code == 0
-            assert "No new patterns to sync from .gitignore" in result.stdout
-            assert "All patterns already in ignore list" in result.stdout
-            assert "(2 total)" in result.stdout
-            mock_context_manager.sync_gitignore.assert_called_once()
+    def test_list_truncates_large_directories(self, runner, mock_context_manager):
+        """Test list caps files per directory unless --full is given."""
+        files = {f"/test/dir/f{i:03d}.py" for i in range(60)}
+        mock_context_manager.files = files
+        mock_context_manager.relative_paths.return_value = {
+            f: f.removeprefix("/test/dir/") for f in files
+        }
 
-    def test_gitignore_sync_backward_compatibility(self, runner, mock_context_manager):
-        """Test that gitignore-sync still works as hidden alias."""
-        # Setup mocks
-        mock_context_manager.base_dir = Path("/test/dir")
+        result = runner.invoke(app, ["list"])
+        assert "f049.py" in result.stdout
+        assert "f050.py" not in result.stdout
+        assert "… (+10 more)" in result.stdout
 
-        with patch.object(Path, "exists") as mock_exists:
-            mock_exists.return_value = True
-            mock_context_manager.sync_gitignore.return_value = (2, ["*.bak", "temp/"])
+        result = runner.invoke(app, ["list", "--full"])
+        assert "f059.py" in result.stdout
+        assert "more)" not in result.stdout
 
-            # Run command using old name
-            result = runner.invoke(app, ["gitignore-sync"])
 
-            # Verify it works the same way
-            assert result.exit_code == 0
-            assert "Added 2 new patterns from .gitignore:" in result.stdout
-            assert "*.bak" in result.stdout
-            assert "temp/" in result.stdout
-            mock_context_manager.sync_gitignore.assert_called_once()
+class TestPatternLists:
+    """Test the plain pattern listings."""
 
-    def test_gis_not_shown_in_help_gitignore_sync_hidden(self, runner):
-        """Test that gis is shown in help but gitignore-sync is hidden."""
-        # Get main help
-        result = runner.invoke(app, ["--help"])
+    def test_ignore_list_prints_patterns_verbatim(self, runner, mock_context_manager):
+        """Test patterns with brackets are not treated as markup."""
+        mock_context_manager.list_ignore_patterns.return_value = [
+            "*.py[cod]",
+            "!keep/",
+        ]
 
-        # Verify gis is shown and gitignore-sync is not
-        assert "gis" in result.stdout
-        assert "gitignore-sync" not in result.stdout
+        result = runner.invoke(app, ["ignore-list"])
         assert result.exit_code == 0
+        assert result.stdout.splitlines() == ["Ignore Patterns", "*.py[cod]", "!keep/"]
+
+    def test_ignore_reports_removed_files(self, runner, mock_context_manager):
+        """Test the ignore summary reports removals without claiming a rescan."""
+        mock_context_manager.add_ignore_patterns.return_value = (3, 2)
+
+        result = runner.invoke(app, ["ignore", "*.log"])
+        assert result.exit_code == 0
+        removed = "Removed 3 existing files matching pattern(s) from 2 directories"
+        assert removed in result.stdout
+        assert "Rescanned" not in result.stdout
 
 
 class TestStatusCommand:
@@ -182,10 +260,26 @@ class TestStatusCommand:
         assert "ctxr profile save" in result.stdout
 
 
+class TestVersionCommand:
+    """Test the version command."""
+
+    def test_version_does_not_load_context(self, runner):
+        """Test that version never constructs a ContextManager."""
+        with patch("contextr.cli.ContextManager") as mock_cm_class:
+            get_context_manager.cache_clear()
+            result = runner.invoke(app, ["version"])
+
+        assert result.exit_code == 0
+        assert "ctxr v" in result.stdout
+        mock_cm_class.assert_not_called()
+
+
 class TestProfileStateTracking:
     """Test profile state tracking integration."""
 
-    def test_profile_save_updates_current_profile(self, runner, mock_context_manager):
+    def test_profile_save_updates_current_profile(
+        self, runner, mock_context_manager, mock_profile_manager
+    ):
         """Test that saving a profile updates the current profile name."""
         # Setup mocks
         mock_context_manager.reset_dirty_state = MagicMock()
@@ -193,19 +287,17 @@ class TestProfileStateTracking:
         # Profile doesn't exist
         mock_context_manager.storage.exists.return_value = False
 
-        with patch("contextr.cli.ProfileManager") as MockPM:
-            mock_pm_instance = MockPM.return_value
-            mock_pm_instance.save_profile.return_value = True
-
-            # Run command
-            result = runner.invoke(app, ["profile", "save", "myprofile"])
+        # Run command
+        result = runner.invoke(app, ["profile", "save", "myprofile"])
 
-            # Verify profile tracking was updated
-            assert result.exit_code == 0
-            assert mock_context_manager.current_profile_name == "myprofile"
-            mock_context_manager.reset_dirty_state.assert_called_once()
+        # Verify profile tracking was updated
+        assert result.exit_code == 0
+        assert mock_context_manager.current_profile_name == "myprofile"
+        mock_context_manager.reset_dirty_state.assert_called_once()
 
-    def test_profile_save_without_name_uses_current(self, runner, mock_context_manager):
+    def test_profile_save_without_name_uses_current(
+        self, runner, mock_context_manager, mock_profile_manager
+    ):
         """Test that profile save without name uses current profile."""
         # Setup
         mock_context_manager.current_profile_name = "existing-profile"
@@ -215,19 +307,15 @@ class TestProfileStateTracking:
         # Profile exists, force update
         mock_context_manager.storage.exists.return_value = True
 
-        with patch("contextr.cli.ProfileManager") as MockPM:
-            mock_pm_instance = MockPM.return_value
-            mock_pm_instance.save_profile.return_value = True
+        # Run command without profile name with force flag
+        result = runner.invoke(app, ["profile", "save", "--force"])
 
-            # Run command without profile name with force flag
-            result = runner.invoke(app, ["profile", "save", "--force"])
-
-            # Verify it used the current profile name
-            assert result.exit_code == 0
-            assert "existing-profile" in result.stdout
-            mock_pm_instance.save_profile.assert_called_once()
-            call_args = mock_pm_instance.save_profile.call_args
-            assert call_args[1]["name"] == "existing-profile"
+        # Verify it used the current profile name
+        assert result.exit_code == 0
+        assert "existing-profile" in result.stdout
+        mock_profile_manager.save_profile.assert_called_once()
+        call_args = mock_profile_manager.save_profile.call_args
+        assert call_args[1]["name"] == "existing-profile"
 
     def test_profile_save_without_name_no_current(self, runner, mock_context_manager):
         """Test error when saving without name and no current profile."""
@@ -242,55 +330,64 @@ class TestProfileStateTracking:
         assert "No profile name provided" in result.stdout
         assert "no current profile loaded" in result.stdout
 
-    def test_profile_list_shows_current_profile(self, runner, mock_context_manager):
+    def test_profile_list_shows_current_profile(
+        self, runner, mock_context_manager, mock_profile_manager
+    ):
         """Test that profile list shows current profile indicator."""
         # Setup
         mock_context_manager.current_profile_name = "active-profile"
         mock_context_manager.is_dirty = False
 
-        with patch("contextr.cli.ProfileManager") as MockPM:
-            mock_pm_instance = MockPM.return_value
-            mock_pm_instance.list_profiles.return_value = [
-                {"name": "profile1", "metadata": {}},
-                {"name": "active-profile", "metadata": {}},
-                {"name": "profile3", "metadata": {}},
-            ]
-            mock_pm_instance.format_profiles_table.return_value = Mock()
+        mock_profile_manager.list_profiles.return_value = [
+            {"name": "profile1", "metadata": {}},
+            {"name": "active-profile", "metadata": {}},
+            {"name": "profile3", "metadata": {}},
+        ]
+        mock_profile_manager.format_profiles_table.return_value = Mock()
 
-            # Run command
-            result = runner.invoke(app, ["profile", "list"])
+        # Run command
+        result = runner.invoke(app, ["profile", "list"])
 
-            # Verify
-            assert result.exit_code == 0
-            assert "Current profile: active-profile" in result.stdout
-            assert "unsaved changes" not in result.stdout
+        # Verify
+        assert result.exit_code == 0
+        assert "Current profile: active-profile" in result.stdout
+        assert "unsaved changes" not in result.stdout
 
-    def test_profile_list_shows_dirty_indicator(self, runner, mock_context_manager):
+    def test_profile_list_shows_dirty_indicator(
+        self, runner, mock_context_manager, mock_profile_manager
+    ):
         """Test that profile list shows unsaved changes indicator."""
         # Setup
         mock_context_manager.current_profile_name = "dirty-profile"
         mock_context_manager.is_dirty = True
 
-        with patch("contextr.cli.ProfileManager") as MockPM:
-            mock_pm_instance = MockPM.return_value
-            mock_pm_instance.list_profiles.return_value = [
-                {"name": "dirty-profile", "metadata": {}},
-            ]
-            mock_pm_instance.format_profiles_table.return_value = Mock()
+        mock_profile_manager.list_profiles.return_value = [
+            {"name": "dirty-profile", "metadata": {}},
+        ]
+        mock_profile_manager.format_profiles_table.return_value = Mock()
 
-            # Run command
-            result = runner.invoke(app, ["profile", "list"])
+        # Run command
+        result = runner.invoke(app, ["profile", "list"])
+
+        # Verify
+        assert result.exit_code == 0
+        assert "Current profile: dirty-profile" in result.stdout
+        assert "You have unsaved changes" in result.stdout
 
-            # Verify
-            assert result.exit_code == 0
-            assert "Current profile: dirty-profile" in result.stdout
-            assert "You have unsaved changes" in result.stdout
+
+@pytest.fixture
+def prompts():
+    """Patch typer.prompt and typer.confirm; yields (prompt, confirm)."""
+    with patch("typer.prompt") as mock_prompt, patch("typer.confirm") as mock_confirm:
+        yield mock_prompt, mock_confirm
 
 
 class TestProfileNewCommand:
     """Test the profile new command functionality."""
 
-    def test_profile_new_basic(self, runner, mock_context_manager):
+    def test_profile_new_basic(
+        self, runner, mock_context_manager, mock_profile_manager, prompts
+    ):
         """Test basic profile new command."""
         # Setup
         mock_context_manager.is_dirty = False
@@ -300,35 +397,24 @@ class TestProfileNewCommand:
         mock_context_manager.files = {"src/app.py", "src/utils.py"}
         mock_context_manager.list_ignore_patterns.return_value = []
 
-        with patch("contextr.cli.ProfileManager") as MockPM:
-            mock_pm_instance = MockPM.return_value
-            mock_pm_instance.save_profile.return_value = True
-
-            # Simulate user input for interactive prompts
-            with patch("typer.prompt") as mock_prompt:
-                # Mock pattern entry
-                mock_prompt.side_effect = ["src/**/*.py", ""]  # One pattern, then empty
-
-                with patch("typer.confirm") as mock_confirm:
-                    mock_confirm.return_value = True  # Confirm profile creation
-
-                    # Run command
-                    result = runner.invoke(
-                        app, ["profile", "new", "--name", "test-profile"]
-                    )
-
-                    # Verify
-                    assert result.exit_code == 0
-                    assert "Starting new profile" in result.stdout
-                    assert (
-                        "Profile 'test-profile' created successfully!" in result.stdout
-                    )
-                    mock_context_manager.clear.assert_called_once()
-                    mock_context_manager.watch_paths.assert_called_once_with(
-                        ["src/**/*.py"]
-                    )
-
-    def test_profile_new_with_unsaved_changes(self, runner, mock_context_manager):
+        # Simulate user input for interactive prompts
+        mock_prompt, mock_confirm = prompts
+        mock_prompt.side_effect = ["src/**/*.py", ""]  # One pattern, then empty
+        mock_confirm.return_value = True  # Confirm profile creation
+
+        # Run command
+        result = runner.invoke(app, ["profile", "new", "--name", "test-profile"])
+
+        # Verify
+        assert result.exit_code == 0
+        assert "Starting new profile" in result.stdout
+        assert "Profile 'test-profile' created successfully!" in result.stdout
+        mock_context_manager.clear.assert_called_once()
+        mock_context_manager.watch_paths.assert_called_once_with(["src/**/*.py"])
+
+    def test_profile_new_with_unsaved_changes(
+        self, runner, mock_context_manager, mock_profile_manager, prompts
+    ):
         """Test profile new prompts to save unsaved changes."""
         # Setup
         mock_context_manager.is_dirty = True
@@ -339,63 +425,82 @@ class TestProfileNewCommand:
         mock_context_manager.watch_paths = MagicMock()
         mock_context_manager.reset_dirty_state = MagicMock()
 
-        with patch("contextr.cli.ProfileManager") as MockPM:
-            mock_pm_instance = MockPM.return_value
-            mock_pm_instance.save_profile.return_value = True
-
-            with patch("typer.prompt") as mock_prompt:
-                # First prompt: save changes? yes
-                # Second/third prompts: pattern entry
-                mock_prompt.side_effect = ["y", "new/**/*.js", ""]
-
-                with patch("typer.confirm") as mock_confirm:
-                    mock_confirm.return_value = True
-
-                    # Run command
-                    result = runner.invoke(
-                        app, ["profile", "new", "--name", "new-profile"]
-                    )
-
-                    # Verify
-                    assert result.exit_code == 0
-                    assert "Saved changes to 'old-profile'" in result.stdout
-                    # Verify save was called for old profile (without ignores)
-                    # First call saves old profile, second saves new profile
-                    assert mock_pm_instance.save_profile.call_count == 2
-                    # First call should be old profile with old patterns
-                    first_call = mock_pm_instance.save_profile.call_args_list[0]
-                    assert first_call[1]["name"] == "old-profile"
-                    assert first_call[1]["watched_patterns"] == ["old/**/*.py"]
-
-    def test_profile_new_cancel_unsaved_changes(self, runner, mock_context_manager):
+        mock_prompt, mock_confirm = prompts
+        # First prompt: save changes? yes
+        # Second/third prompts: pattern entry
+        mock_prompt.side_effect = ["y", "new/**/*.js", ""]
+        mock_confirm.return_value = True
+
+        # Run command
+        result = runner.invoke(app, ["profile", "new", "--name", "new-profile"])
+
+        # Verify
+        assert result.exit_code == 0
+        assert "Saved changes to 'old-profile'" in result.stdout
+        # Verify save was called for old profile (without ignores)
+        # First call saves old profile, second saves new profile
+        assert mock_profile_manager.save_profile.call_count == 2
+        # First call should be old profile with old patterns
+        first_call = mock_profile_manager.save_profile.call_args_list[0]
+        assert first_call[1]["name"] == "old-profile"
+        assert first_call[1]["watched_patterns"] == ["old/**/*.py"]
+
+    def test_profile_new_cancel_unsaved_changes(
+        self, runner, mock_context_manager, prompts
+    ):
         """Test cancelling profile new when unsaved changes exist."""
         # Setup
         mock_context_manager.is_dirty = True
         mock_context_manager.current_profile_name = "current-profile"
 
-        with patch("typer.prompt") as mock_prompt:
-            mock_prompt.return_value = "cancel"
+        mock_prompt, _ = prompts
+        mock_prompt.return_value = "cancel"
 
-            # Run command
-            result = runner.invoke(app, ["profile", "new", "--name", "new-profile"])
+        # Run command
+        result = runner.invoke(app, ["profile", "new", "--name", "new-profile"])
 
-            # Verify
-            assert result.exit_code == 1  # Aborted
-            assert "Profile creation cancelled" in result.stdout
+        # Verify
+        assert result.exit_code == 1  # Aborted
+        assert "Profile creation cancelled" in result.stdout
 
-    def test_profile_new_no_patterns(self, runner, mock_context_manager):
+    def test_profile_new_no_patterns(self, runner, mock_context_manager, prompts):
         """Test profile new with no patterns provided."""
         # Setup
         mock_context_manager.is_dirty = False
         mock_context_manager.clear = MagicMock()
         mock_context_manager.list_ignore_patterns.return_value = []
 
-        with patch("typer.prompt") as mock_prompt:
-            mock_prompt.return_value = ""  # No patterns
+        mock_prompt, _ = prompts
+        mock_prompt.return_value = ""  # No patterns
 
-            # Run command
-            result = runner.invoke(app, ["profile", "new", "--name", "empty-profile"])
+        # Run command
+        result = runner.invoke(app, ["profile", "new", "--name", "empty-profile"])
 
-            # Verify
-            assert result.exit_code == 1  # Aborted
-            assert "No watch patterns provided" in result.stdout
+        # Verify
+        assert result.exit_code == 1  # Aborted
+        assert "No watch patterns provided" in result.stdout
+
+
+def test_cli_import_defers_clipboard_and_table() -> None:
+    """Importing the CLI must not pull in pyperclip or rich.table."""
+    import os
+    import subprocess
+    import sys
+
+    import contextr
+
+    # Make the package importable regardless of the current working directory
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(contextr.__file__))
+    code = (
+        "import sys, contextr.cli; "
+        "print(any(m == 'pyperclip' or m == 'rich.table' for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    assert result.stdout.strip() == "False"
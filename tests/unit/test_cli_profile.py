@@ -1,37 +1,45 @@
 """Unit tests for CLI profile commands."""
 
+from dataclasses import dataclass
 from pathlib import Path
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from typing import Optional, Tuple
+from unittest.mock import Mock
 
 import pytest
-from typer.testing import CliRunner
+from typer.testing import CliRunner, Result
 
+from contextr import cli
 from contextr.cli import app
 from contextr.profile import Profile, ProfileNotFoundError
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def runner() -> CliRunner:
-    """Create a CLI test runner."""
+    """CLI runner shared by all tests; invoke() isolates each run itself."""
     return CliRunner()
 
 
 @pytest.fixture
-def mock_context_manager() -> Mock:
-    """Mock context manager for testing."""
+def mock_context_manager(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Stand-in for the CLI's context manager; profile commands only read these."""
+    ctx = SimpleNamespace(storage=Mock(), base_dir=Path("/test/dir"))
+    monkeypatch.setattr(cli, "get_context_manager", lambda: ctx)
+    return ctx
+
+
+@pytest.fixture
+def mock_profile_manager(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """Mock ProfileManager instance created by the CLI."""
     mock = Mock()
-    mock.storage = Mock()
-    mock.base_dir = Path("/test/dir")
-    mock.watched_patterns = ["*.py", "*.md"]
-    mock.list_ignore_patterns.return_value = ["*.pyc", "__pycache__"]
-    mock.files = []
+    monkeypatch.setattr(cli, "ProfileManager", lambda *args, **kwargs: mock)
     return mock
 
 
-@pytest.fixture
-def sample_profile() -> Profile:
-    """Create a sample profile for testing."""
-    return Profile(
+# Profiles returned by the mocked load_profile, keyed by variant; tests only
+# read them
+PROFILES = {
+    "with-desc": Profile(
         name="test-profile",
         watched_patterns=["*.py", "*.md"],
         metadata={
@@ -39,223 +47,185 @@ def sample_profile() -> Profile:
             "updated_at": "2025-07-25T12:00:00Z",
             "description": "Test profile description",
         },
-    )
-
-
-class TestProfileDeleteCommand:
-    """Test the profile delete command."""
-
-    @patch("contextr.cli.context_manager")
-    @patch("contextr.cli.ProfileManager")
-    def test_delete_profile_with_confirmation(
-        self,
-        mock_profile_manager_class: Mock,
-        mock_context_manager: Mock,
-        runner: CliRunner,
-        sample_profile: Profile,
-    ) -> None:
-        """Test deleting a profile with user confirmation."""
-        # Setup mocks
-        mock_context_manager.storage = Mock()
-        mock_context_manager.base_dir = Path("/test/dir")
-        mock_profile_manager = Mock()
-        mock_profile_manager_class.return_value = mock_profile_manager
-        mock_profile_manager.load_profile.return_value = sample_profile
-        mock_profile_manager.delete_profile.return_value = True
-
-        # Run command with confirmation
-        result = runner.invoke(app, ["profile", "delete", "test-profile"], input="y\n")
-
-        assert result.exit_code == 0
-        assert "Profile: test-profile" in result.output
-        assert "Description: Test profile description" in result.output
-        assert "Watched patterns: 2" in result.output
-        assert "Created: 2025-07-25 12:00" in result.output
-        assert "Delete profile 'test-profile'?" in result.output
-        assert "✓ Profile 'test-profile' deleted successfully!" in result.output
-
-        mock_profile_manager.load_profile.assert_called_once_with("test-profile")
-        mock_profile_manager.delete_profile.assert_called_once_with("test-profile")
-
-    @patch("contextr.cli.context_manager")
-    @patch("contextr.cli.ProfileManager")
-    def test_delete_profile_with_force(
-        self,
-        mock_profile_manager_class: Mock,
-        mock_context_manager: Mock,
-        runner: CliRunner,
-        sample_profile: Profile,
-    ) -> None:
-        """Test deleting a profile with --force flag."""
-        # Setup mocks
-        mock_context_manager.storage = Mock()
-        mock_context_manager.base_dir = Path("/test/dir")
-        mock_profile_manager = Mock()
-        mock_profile_manager_class.return_value = mock_profile_manager
-        mock_profile_manager.load_profile.return_value = sample_profile
-        mock_profile_manager.delete_profile.return_value = True
-
-        # Run command with --force flag
-        result = runner.invoke(app, ["profile", "delete", "test-profile", "--force"])
-
-        assert result.exit_code == 0
-        assert "Profile: test-profile" in result.output
-        assert "Delete profile 'test-profile'?" not in result.output
-        assert "✓ Profile 'test-profile' deleted successfully!" in result.output
-
-        mock_profile_manager.load_profile.assert_called_once_with("test-profile")
-        mock_profile_manager.delete_profile.assert_called_once_with("test-profile")
-
-    @patch("contextr.cli.context_manager")
-    @patch("contextr.cli.ProfileManager")
-    def test_delete_profile_cancelled(
-        self,
-        mock_profile_manager_class: Mock,
-        mock_context_manager: Mock,
-        runner: CliRunner,
-        sample_profile: Profile,
-    ) -> None:
-        """Test cancelling profile deletion."""
-        # Setup mocks
-        mock_context_manager.storage = Mock()
-        mock_context_manager.base_dir = Path("/test/dir")
-        mock_profile_manager = Mock()
-        mock_profile_manager_class.return_value = mock_profile_manager
-        mock_profile_manager.load_profile.return_value = sample_profile
-
-        # Run command and cancel
-        result = runner.invoke(app, ["profile", "delete", "test-profile"], input="n\n")
-
-        assert result.exit_code == 1
-        assert "Profile: test-profile" in result.output
-        assert "Delete profile 'test-profile'?" in result.output
-        assert "Profile deletion cancelled." in result.output
-
-        mock_profile_manager.load_profile.assert_called_once_with("test-profile")
-        mock_profile_manager.delete_profile.assert_not_called()
-
-    @patch("contextr.cli.context_manager")
-    @patch("contextr.cli.ProfileManager")
-    def test_delete_profile_not_found(
-        self,
-        mock_profile_manager_class: Mock,
-        mock_context_manager: Mock,
-        runner: CliRunner,
-    ) -> None:
-        """Test deleting a non-existent profile."""
-        # Setup mocks
-        mock_context_manager.storage = Mock()
-        mock_context_manager.base_dir = Path("/test/dir")
-        mock_profile_manager = Mock()
-        mock_profile_manager_class.return_value = mock_profile_manager
-        mock_profile_manager.load_profile.side_effect = ProfileNotFoundError(
-            "Profile 'nonexistent' not found. "
-            "Use 'ctxr profile list' to see available profiles."
-        )
+    ),
+    "no-desc": Profile(
+        name="no-desc",
+        watched_patterns=["*.py"],
+        metadata={
+            "created_at": "2025-07-25T12:00:00Z",
+            "updated_at": "2025-07-25T12:00:00Z",
+        },
+    ),
+    "bad-date": Profile(
+        name="bad-date",
+        watched_patterns=["*.py"],
+        metadata={
+            "created_at": "invalid-date",
+            "updated_at": "invalid-date",
+            "description": "Test",
+        },
+    ),
+}
 
-        # Run command
-        result = runner.invoke(app, ["profile", "delete", "nonexistent"])
 
-        assert result.exit_code == 1
-        assert "Profile 'nonexistent' not found." in result.output
-        assert "Use 'ctxr profile list' to see available profiles." in result.output
+def delete_profile(
+    runner: CliRunner, name: str, *options: str, input: Optional[str] = None
+) -> Result:
+    """Run 'profile delete', letting unexpected exceptions fail the test."""
+    return runner.invoke(
+        app, ["profile", "delete", name, *options], input=input, catch_exceptions=False
+    )
 
-        mock_profile_manager.load_profile.assert_called_once_with("nonexistent")
-        mock_profile_manager.delete_profile.assert_not_called()
 
-    @patch("contextr.cli.context_manager")
-    @patch("contextr.cli.ProfileManager")
-    def test_delete_profile_without_description(
-        self,
-        mock_profile_manager_class: Mock,
-        mock_context_manager: Mock,
-        runner: CliRunner,
-    ) -> None:
-        """Test deleting a profile without description."""
-        # Setup mocks
-        mock_context_manager.storage = Mock()
-        mock_context_manager.base_dir = Path("/test/dir")
-        mock_profile_manager = Mock()
-        mock_profile_manager_class.return_value = mock_profile_manager
-
-        # Profile without description
-        profile = Profile(
+@dataclass(frozen=True)
+class DeleteScenario:
+    """One 'profile delete' invocation and what it should produce."""
+
+    name: str
+    # Key into PROFILES; None makes load_profile raise ProfileNotFoundError
+    profile: Optional[str]
+    options: Tuple[str, ...] = ()
+    stdin: Optional[str] = None
+    delete_returns: bool = True
+    exit_code: int = 0
+    expected_in: Tuple[str, ...] = ()
+    expected_not_in: Tuple[str, ...] = ()
+    expect_delete_called: bool = True
+
+
+DELETE_SCENARIOS = [
+    pytest.param(
+        DeleteScenario(
+            name="test-profile",
+            profile="with-desc",
+            stdin="y\n",
+            expected_in=(
+                "Profile: test-profile",
+                "Description: Test profile description",
+                "Watched patterns: 2",
+                "Created: 2025-07-25 12:00",
+                "Delete profile 'test-profile'?",
+                "✓ Profile 'test-profile' deleted successfully!",
+            ),
+        ),
+        id="with-confirmation",
+    ),
+    pytest.param(
+        DeleteScenario(
+            name="test-profile",
+            profile="with-desc",
+            options=("--force",),
+            expected_in=(
+                "Profile: test-profile",
+                "✓ Profile 'test-profile' deleted successfully!",
+            ),
+            expected_not_in=("Delete profile 'test-profile'?",),
+        ),
+        id="with-force",
+    ),
+    pytest.param(
+        DeleteScenario(
+            name="test-profile",
+            profile="with-desc",
+            stdin="n\n",
+            exit_code=1,
+            expected_in=(
+                "Profile: test-profile",
+                "Delete profile 'test-profile'?",
+                "Profile deletion cancelled.",
+            ),
+            expect_delete_called=False,
+        ),
+        id="cancelled",
+    ),
+    pytest.param(
+        DeleteScenario(
+            name="nonexistent",
+            profile=None,
+            exit_code=1,
+            expected_in=(
+                "Profile 'nonexistent' not found.",
+                "Use 'ctxr profile list' to see available profiles.",
+            ),
+            expect_delete_called=False,
+        ),
+        id="not-found",
+    ),
+    pytest.param(
+        DeleteScenario(
             name="no-desc",
-            watched_patterns=["*.py"],
-            metadata={
-                "created_at": "2025-07-25T12:00:00Z",
-                "updated_at": "2025-07-25T12:00:00Z",
-            },
-        )
-        mock_profile_manager.load_profile.return_value = profile
-        mock_profile_manager.delete_profile.return_value = True
-
-        # Run command with force
-        result = runner.invoke(app, ["profile", "delete", "no-desc", "--force"])
-
-        assert result.exit_code == 0
-        assert "Profile: no-desc" in result.output
-        assert "Description:" not in result.output
-        assert "✓ Profile 'no-desc' deleted successfully!" in result.output
-
-    @patch("contextr.cli.context_manager")
-    @patch("contextr.cli.ProfileManager")
-    def test_delete_profile_with_invalid_date(
-        self,
-        mock_profile_manager_class: Mock,
-        mock_context_manager: Mock,
-        runner: CliRunner,
-    ) -> None:
-        """Test deleting a profile with invalid creation date."""
-        # Setup mocks
-        mock_context_manager.storage = Mock()
-        mock_context_manager.base_dir = Path("/test/dir")
-        mock_profile_manager = Mock()
-        mock_profile_manager_class.return_value = mock_profile_manager
-
-        # Profile with invalid date
-        profile = Profile(
+            profile="no-desc",
+            options=("--force",),
+            expected_in=(
+                "Profile: no-desc",
+                "✓ Profile 'no-desc' deleted successfully!",
+            ),
+            expected_not_in=("Description:",),
+        ),
+        id="without-description",
+    ),
+    pytest.param(
+        DeleteScenario(
             name="bad-date",
-            watched_patterns=["*.py"],
-            metadata={
-                "created_at": "invalid-date",
-                "updated_at": "invalid-date",
-                "description": "Test",
-            },
-        )
-        mock_profile_manager.load_profile.return_value = profile
-        mock_profile_manager.delete_profile.return_value = True
+            profile="bad-date",
+            options=("--force",),
+            expected_in=(
+                "Profile: bad-date",
+                "✓ Profile 'bad-date' deleted successfully!",
+            ),
+            # Should skip invalid date
+            expected_not_in=("Created:",),
+        ),
+        id="invalid-date",
+    ),
+    pytest.param(
+        DeleteScenario(
+            name="test-profile",
+            profile="with-desc",
+            options=("--force",),
+            delete_returns=False,
+            exit_code=1,
+            expected_in=("Failed to delete profile 'test-profile'",),
+        ),
+        id="deletion-fails",
+    ),
+]
 
-        # Run command with force
-        result = runner.invoke(app, ["profile", "delete", "bad-date", "--force"])
 
-        assert result.exit_code == 0
-        assert "Profile: bad-date" in result.output
-        assert "Created:" not in result.output  # Should skip invalid date
-        assert "✓ Profile 'bad-date' deleted successfully!" in result.output
+class TestProfileDeleteCommand:
+    """Test the profile delete command."""
 
-    @patch("contextr.cli.context_manager")
-    @patch("contextr.cli.ProfileManager")
-    def test_delete_profile_deletion_fails(
+    @pytest.mark.parametrize("scenario", DELETE_SCENARIOS)
+    def test_delete_profile(
         self,
-        mock_profile_manager_class: Mock,
-        mock_context_manager: Mock,
+        mock_context_manager: SimpleNamespace,
+        mock_profile_manager: Mock,
         runner: CliRunner,
-        sample_profile: Profile,
+        scenario: DeleteScenario,
     ) -> None:
-        """Test when profile deletion fails."""
+        """Test the output and calls of each delete scenario."""
         # Setup mocks
-        mock_context_manager.storage = Mock()
-        mock_context_manager.base_dir = Path("/test/dir")
-        mock_profile_manager = Mock()
-        mock_profile_manager_class.return_value = mock_profile_manager
-        mock_profile_manager.load_profile.return_value = sample_profile
-        mock_profile_manager.delete_profile.return_value = False
-
-        # Run command with force
-        result = runner.invoke(app, ["profile", "delete", "test-profile", "--force"])
-
-        assert result.exit_code == 1
-        assert "Failed to delete profile 'test-profile'" in result.output
+        if scenario.profile is None:
+            mock_profile_manager.load_profile.side_effect = ProfileNotFoundError(
+                f"Profile '{scenario.name}' not found. "
+                "Use 'ctxr profile list' to see available profiles."
+            )
+        else:
+            mock_profile_manager.load_profile.return_value = PROFILES[scenario.profile]
+        mock_profile_manager.delete_profile.return_value = scenario.delete_returns
+
+        result = delete_profile(
+            runner, scenario.name, *scenario.options, input=scenario.stdin
+        )
 
-        mock_profile_manager.delete_profile.assert_called_once_with("test-profile")
+        assert result.exit_code == scenario.exit_code
+        for text in scenario.expected_in:
+            assert text in result.output
+        for text in scenario.expected_not_in:
+            assert text not in result.output
+
+        mock_profile_manager.load_profile.assert_called_once_with(scenario.name)
+        if scenario.expect_delete_called:
+            mock_profile_manager.delete_profile.assert_called_once_with(scenario.name)
+        else:
+            mock_profile_manager.delete_profile.assert_not_called()
@@ -1,63 +1,123 @@
 """Tests for CLI sync command options and fallbacks."""
 
 from pathlib import Path
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import Mock
 
+import pytest
 from typer.testing import CliRunner
 
-from contextr.cli import app
+from contextr import cli
+from contextr.cli import app, start_clipboard_copy
 
 
-def test_sync_writes_file_and_handles_clipboard_failure(tmp_path: Path) -> None:
+@pytest.fixture
+def context(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Stand-in for the CLI's context manager, rooted at tmp_path."""
+    ctx = SimpleNamespace(base_dir=tmp_path, files=set(), rel_paths={})
+    ctx.refresh_watched = lambda: {"added": 0, "removed": 0}
+    ctx.relative_paths = lambda: dict(ctx.rel_paths)
+    monkeypatch.setattr(cli, "get_context_manager", lambda: ctx)
+    return ctx
+
+
+def add_file(context: SimpleNamespace, name: str, text: str) -> Path:
+    """Create a file under the context's base_dir and put it in the context."""
+    path = context.base_dir / name
+    path.write_text(text, encoding="utf-8")
+    context.files.add(str(path))
+    context.rel_paths[str(path)] = name
+    return path
+
+
+@pytest.fixture
+def mock_copy(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """Clipboard copy used by the CLI."""
+    mock = Mock()
+    monkeypatch.setattr(cli, "copy_to_clipboard", mock)
+    return mock
+
+
+def test_sync_writes_file_and_handles_clipboard_failure(
+    tmp_path: Path, context: SimpleNamespace, mock_copy: Mock
+) -> None:
+    runner = CliRunner()
+    add_file(context, "a.txt", "hello")
+    out_file = tmp_path / "out.md"
+    mock_copy.side_effect = Exception("no clipboard")
+
+    result = runner.invoke(app, ["sync", "--to-file", str(out_file)])
+
+    assert result.exit_code == 0
+    assert "Saved export to" in result.stdout
+    assert "Clipboard failed" in result.stdout
+    assert out_file.exists()
+    assert out_file.read_text(encoding="utf-8").startswith("# Project Context")
+
+
+def test_sync_no_clipboard_absolute_paths(
+    tmp_path: Path, context: SimpleNamespace, mock_copy: Mock
+) -> None:
     runner = CliRunner()
-    sample = tmp_path / "a.txt"
-    sample.write_text("hello", encoding="utf-8")
+    sample = add_file(context, "a.txt", "x")
     out_file = tmp_path / "out.md"
 
-    with (
-        patch("contextr.cli.context_manager") as mock_cm,
-        patch("contextr.cli.pyperclip.copy", side_effect=Exception("no clipboard")),
-    ):
-        mock_cm.base_dir = tmp_path
-        mock_cm.files = {str(sample)}
-        mock_cm.refresh_watched.return_value = {"added": 0, "removed": 0}
+    result = runner.invoke(
+        app,
+        [
+            "sync",
+            "--to-file",
+            str(out_file),
+            "--no-clipboard",
+            "--absolute",
+        ],
+    )
 
-        result = runner.invoke(app, ["sync", "--to-file", str(out_file)])
+    assert result.exit_code == 0
+    mock_copy.assert_not_called()
+    content = out_file.read_text(encoding="utf-8")
+    # Absolute path should appear in the "File Contents" section header
+    assert f"### {str(sample)}" in content
 
-        assert result.exit_code == 0
-        assert "Saved export to" in result.stdout
-        assert "Clipboard failed" in result.stdout
-        assert out_file.exists()
-        assert out_file.read_text(encoding="utf-8").startswith("# Project Context")
 
+def test_sync_streams_file_only_export(
+    tmp_path: Path,
+    context: SimpleNamespace,
+    mock_copy: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    runner = CliRunner()
+    add_file(context, "a.txt", "hello")
+    out_file = tmp_path / "out.md"
+    expected = cli.format_export_content(
+        context.files, context.base_dir, rel_paths=context.rel_paths
+    )
+    build = Mock(side_effect=AssertionError("export text built in memory"))
+    monkeypatch.setattr(cli, "format_export_content", build)
 
-def test_sync_no_clipboard_absolute_paths(tmp_path: Path) -> None:
+    result = runner.invoke(app, ["sync", "--to-file", str(out_file), "--no-clipboard"])
+
+    assert result.exit_code == 0
+    build.assert_not_called()
+    mock_copy.assert_not_called()
+    assert out_file.read_text(encoding="utf-8") == expected
+
+
+def test_sync_copies_large_export_while_writing_file(
+    tmp_path: Path,
+    context: SimpleNamespace,
+    mock_copy: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
     runner = CliRunner()
-    sample = tmp_path / "a.txt"
-    sample.write_text("x", encoding="utf-8")
+    add_file(context, "big.txt", "x" * 100_000)
     out_file = tmp_path / "out.md"
+    bg = Mock(wraps=start_clipboard_copy)
+    monkeypatch.setattr(cli, "start_clipboard_copy", bg)
+
+    result = runner.invoke(app, ["sync", "--to-file", str(out_file)])
 
-    with (
-        patch("contextr.cli.context_manager") as mock_cm,
-        patch("contextr.cli.pyperclip.copy") as mock_copy,
-    ):
-        mock_cm.base_dir = tmp_path
-        mock_cm.files = {str(sample)}
-        mock_cm.refresh_watched.return_value = {"added": 0, "removed": 0}
-
-        result = runner.invoke(
-            app,
-            [
-                "sync",
-                "--to-file",
-                str(out_file),
-                "--no-clipboard",
-                "--absolute",
-            ],
-        )
-
-        assert result.exit_code == 0
-        mock_copy.assert_not_called()
-        content = out_file.read_text(encoding="utf-8")
-        # Absolute path should appear in the "File Contents" section header
-        assert f"### {str(sample)}" in content
+    assert result.exit_code == 0
+    bg.assert_called_once()
+    mock_copy.assert_called_once_with(out_file.read_text(encoding="utf-8"))
+    assert "Exported 1 files to clipboard!" in result.stdout
@@ -1,8 +1,19 @@
 """Tests for export formatter robustness."""
 
+import os
+from io import StringIO
 from pathlib import Path
 
-from contextr.formatters import format_export_content
+import pytest
+from rich.console import Console
+
+from contextr import formatters
+from contextr.formatters import (
+    READ_AHEAD,
+    format_export_content,
+    get_file_tree,
+    write_export_content,
+)
 
 
 def test_dynamic_code_fences_avoid_collision(tmp_path: Path) -> None:
@@ -26,3 +37,144 @@ def test_truncation_marker_for_large_files(tmp_path: Path) -> None:
         {str(p)}, tmp_path, relative=True, include_contents=True, max_bytes=100
     )
     assert "[... truncated ...]" in out
+
+
+def test_read_of_large_file(tmp_path: Path) -> None:
+    p = tmp_path / "big.txt"
+    data = "é" * 64 * 1024  # 2 bytes per char
+    p.write_text(data, encoding="utf-8")
+    out = format_export_content({str(p)}, tmp_path, max_bytes=len(data) * 2)
+    assert data in out
+    assert "[... truncated ...]" not in out
+
+    # Cutting mid-character replaces the partial byte
+    out = format_export_content({str(p)}, tmp_path, max_bytes=3)
+    assert "\né\ufffd\n" in out
+    assert "[... truncated ...]" in out
+
+
+def test_read_text_does_not_trust_reported_size(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "grown.txt"
+    p.write_bytes(b"a" * 100)
+    real_fstat = os.fstat
+
+    def stale_fstat(fd: int) -> os.stat_result:
+        # Size as seen before the file grew (or as reported by /proc files)
+        st = list(real_fstat(fd))
+        st[6] = 10
+        return os.stat_result(st)
+
+    monkeypatch.setattr(formatters.os, "fstat", stale_fstat)
+    assert formatters._read_text(str(p), max_bytes=100) == ("a" * 100, False)  # type: ignore[reportPrivateUsage]
+    assert formatters._read_text(str(p), max_bytes=50) == ("a" * 50, True)  # type: ignore[reportPrivateUsage]
+
+
+def test_write_export_content_matches_string_output(tmp_path: Path) -> None:
+    a = tmp_path / "a.py"
+    b = tmp_path / "sub" / "b.txt"
+    b.parent.mkdir()
+    a.write_text("print('a')\n", encoding="utf-8")
+    b.write_bytes(b"b" * 200)
+    files = {str(a), str(b)}
+
+    for include_contents in (True, False):
+        buf = StringIO()
+        write_export_content(
+            buf, files, tmp_path, include_contents=include_contents, max_bytes=100
+        )
+        assert buf.getvalue() == format_export_content(
+            files, tmp_path, include_contents=include_contents, max_bytes=100
+        )
+
+
+def test_prefetched_contents_keep_sorted_order(tmp_path: Path) -> None:
+    files: set[str] = set()
+    for i in range(READ_AHEAD * 2 + 3):
+        p = tmp_path / f"f{i:04d}.txt"
+        p.write_text(f"content {i}", encoding="utf-8")
+        files.add(str(p))
+
+    out = format_export_content(files, tmp_path)
+    body = out.split("## File Contents", 1)[1]
+    headers = [line[4:] for line in body.splitlines() if line.startswith("### ")]
+    assert headers == sorted(Path(f).name for f in files)
+    for i in range(READ_AHEAD * 2 + 3):
+        assert f"### f{i:04d}.txt\n```text\ncontent {i}\n```" in body
+
+
+def test_file_tree_lists_files_before_directories(tmp_path: Path) -> None:
+    files = {
+        str(tmp_path / "b.py"),
+        str(tmp_path / "a" / "z.py"),
+        str(tmp_path / "a" / "sub" / "y.py"),
+        str(tmp_path / "a" / "x.py"),
+    }
+    tree = get_file_tree(files, tmp_path)
+
+    assert [str(n.label) for n in tree.children] == ["📄 b.py", "📁 a"]
+    a_node = tree.children[1]
+    assert [str(n.label) for n in a_node.children] == [
+        "📄 x.py",
+        "📄 z.py",
+        "📁 sub",
+    ]
+    assert [str(n.label) for n in a_node.children[2].children] == ["📄 y.py"]
+
+
+def test_precomputed_relative_paths_are_used(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "src" / "a.py"
+    p.parent.mkdir()
+    p.write_text("x = 1\n", encoding="utf-8")
+    expected = format_export_content({str(p)}, tmp_path)
+
+    def fail(file_path: str, base_dir: Path) -> str:
+        raise AssertionError("paths should not be resolved again")
+
+    monkeypatch.setattr(formatters, "_relative_path", fail)
+    rel_paths = {str(p): os.path.join("src", "a.py")}
+    assert format_export_content({str(p)}, tmp_path, rel_paths=rel_paths) == expected
+
+
+def test_export_tree_matches_rich_rendering(tmp_path: Path) -> None:
+    files = {
+        str(tmp_path / "b.py"),
+        str(tmp_path / "a" / "z.py"),
+        str(tmp_path / "a" / "sub" / "y.py"),
+        str(tmp_path / "a" / "x.py"),
+        str(tmp_path / "c" / "w.py"),
+    }
+    console = Console(record=True, file=StringIO(), width=200)
+    console.print(get_file_tree(files, tmp_path))
+    rich_text = console.export_text().strip()
+
+    out = format_export_content(files, tmp_path, include_contents=False)
+    assert f"```\n{rich_text}\n```" in out
+
+
+def test_tree_keeps_bracketed_names(tmp_path: Path) -> None:
+    files = {str(tmp_path / "pages" / "[id].tsx")}
+    out = format_export_content(files, tmp_path, include_contents=False)
+    assert "📄 [id].tsx" in out
+    tree = get_file_tree(files, tmp_path)
+    console = Console(record=True, file=StringIO())
+    console.print(tree)
+    assert "📄 [id].tsx" in console.export_text()
+
+
+def test_file_tree_truncates_files_per_directory(tmp_path: Path) -> None:
+    files = {str(tmp_path / f"f{i}.py") for i in range(5)}
+    files.add(str(tmp_path / "sub" / "g.py"))
+    tree = get_file_tree(files, tmp_path, max_per_dir=3)
+
+    assert [str(n.label) for n in tree.children] == [
+        "📄 f0.py",
+        "📄 f1.py",
+        "📄 f2.py",
+        "… (+2 more)",
+        "📁 sub",
+    ]
+    assert [str(n.label) for n in tree.children[4].children] == ["📄 g.py"]
@@ -1,75 +1,130 @@
 """Unit tests for ContextManager auto-sync behavior."""
 
-import tempfile
+import os
 from pathlib import Path
+from typing import List, Set
 
 import pytest
 
 from contextr.manager import ContextManager
 from contextr.storage import JsonStorage
 
+# Project tree written by write_test_files (relative path -> contents)
+TEST_FILES = {
+    "README.md": "# Test Project",
+    "setup.py": "setup()",
+    "src/__init__.py": "",
+    "src/main.py": "def main(): pass",
+    "src/utils/__init__.py": "",
+    "src/utils/helper.py": "def help(): pass",
+    "tests/test_main.py": "def test_main(): pass",
+    "docs/api.md": "# API",
+    "docs/guide.md": "# Guide",
+}
+SRC_PY_FILES = {
+    "src/__init__.py",
+    "src/main.py",
+    "src/utils/__init__.py",
+    "src/utils/helper.py",
+}
+
+
+def write_test_files(root: Path) -> None:
+    """Write TEST_FILES under root."""
+    for parent in {os.path.dirname(rel) for rel in TEST_FILES}:
+        os.makedirs(root / parent, exist_ok=True)
+    for rel, text in TEST_FILES.items():
+        (root / rel).write_text(text)
+
+
+def relative_files(manager: ContextManager) -> Set[str]:
+    """Context files relative to the base dir, with '/' separators."""
+    return {f.replace("\\", "/") for f in manager.get_file_paths(relative=True)}
+
+
+@pytest.fixture(scope="module")
+def project_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Test file structure shared by the read-only watch cases."""
+    root = tmp_path_factory.mktemp("project")
+    write_test_files(root)
+    return root
+
 
 class TestContextManagerAutoSync:
     """Test auto-sync behavior where files follow watched patterns."""
 
     @pytest.fixture
-    def temp_dir(self) -> Path:
-        """Create a temporary directory for tests."""
-        with tempfile.TemporaryDirectory() as tmp:
-            yield Path(tmp)
+    def temp_dir(self, tmp_path: Path) -> Path:
+        """Project directory for a test."""
+        return tmp_path
 
     @pytest.fixture
     def manager(self, temp_dir: Path) -> ContextManager:
-        """Create a ContextManager instance with test directory."""
-        # Change to temp directory to avoid side effects
-        import os
-
-        old_cwd = os.getcwd()
-        os.chdir(temp_dir)
+        """Create a ContextManager rooted at the test directory."""
         storage = JsonStorage(temp_dir / ".contextr")
-        manager = ContextManager(storage=storage)
-        yield manager
-        os.chdir(old_cwd)
+        return ContextManager(storage=storage, base_dir=temp_dir)
 
     def create_test_files(self, temp_dir: Path) -> None:
         """Create test file structure."""
-        # Create directories
-        (temp_dir / "src").mkdir()
-        (temp_dir / "src" / "utils").mkdir()
-        (temp_dir / "tests").mkdir()
-        (temp_dir / "docs").mkdir()
-
-        # Create files
-        (temp_dir / "README.md").write_text("# Test Project")
-        (temp_dir / "setup.py").write_text("setup()")
-        (temp_dir / "src" / "__init__.py").write_text("")
-        (temp_dir / "src" / "main.py").write_text("def main(): pass")
-        (temp_dir / "src" / "utils" / "__init__.py").write_text("")
-        (temp_dir / "src" / "utils" / "helper.py").write_text("def help(): pass")
-        (temp_dir / "tests" / "test_main.py").write_text("def test_main(): pass")
-        (temp_dir / "docs" / "api.md").write_text("# API")
-        (temp_dir / "docs" / "guide.md").write_text("# Guide")
-
-    def test_watch_paths_adds_files_automatically(
-        self, manager: ContextManager, temp_dir: Path
+        write_test_files(temp_dir)
+
+    @pytest.mark.parametrize(
+        ("watch_calls", "expected_patterns_added", "expected_files_added", "expected"),
+        [
+            pytest.param(
+                [["src/**/*.py"]],
+                1,
+                4,
+                SRC_PY_FILES,
+                id="adds-matching-files",
+            ),
+            pytest.param(
+                # src/*.py is a subset of src/**/*.py: nothing new is added
+                [["src/**/*.py"], ["src/*.py"]],
+                1,
+                0,
+                SRC_PY_FILES,
+                id="overlapping-patterns-no-duplicates",
+            ),
+            pytest.param(
+                [["/nonexistent/path/*.py"]],
+                1,  # Pattern is added
+                0,  # But no files match
+                set(),
+                id="nonexistent-path",
+            ),
+            pytest.param([], 0, 0, set(), id="no-patterns"),
+        ],
+    )
+    def test_watch_outcomes(
+        self,
+        project_dir: Path,
+        tmp_path: Path,
+        watch_calls: List[List[str]],
+        expected_patterns_added: int,
+        expected_files_added: int,
+        expected: Set[str],
     ) -> None:
-        """Test that watching patterns automatically adds matching files."""
-        self.create_test_files(temp_dir)
-
-        # Watch Python files
-        patterns_added, files_added = manager.watch_paths(["src/**/*.py"])
-
-        assert patterns_added == 1
-        assert files_added == 4  # __init__.py files and main.py, helper.py
-
-        # Verify files are in context
-        files = manager.get_file_paths(relative=True)
-        # Normalize paths for cross-platform compatibility
-        normalized_files = [f.replace("\\", "/") for f in files]
-        assert "src/__init__.py" in normalized_files
-        assert "src/main.py" in normalized_files
-        assert "src/utils/__init__.py" in normalized_files
-        assert "src/utils/helper.py" in normalized_files
+        """Test the files and counts produced by watching patterns."""
+        # Fresh state per case; the project tree is only read
+        manager = ContextManager(
+            storage=JsonStorage(tmp_path / ".contextr"), base_dir=project_dir
+        )
+        patterns_added, files_added = 0, 0
+        for patterns in watch_calls:
+            patterns_added, files_added = manager.watch_paths(patterns)
+
+        assert patterns_added == expected_patterns_added
+        assert files_added == expected_files_added
+        assert len(manager.watched_patterns) == len(
+            {p for patterns in watch_calls for p in patterns}
+        )
+        files = relative_files(manager)
+        assert files == expected
+
+        # Refresh re-adds exactly the watched files
+        assert manager.refresh_files() == len(expected)
+        assert len(manager.files) == len(expected)
 
     def test_unwatch_paths_removes_files_automatically(
         self, manager: ContextManager, temp_dir: Path
@@ -89,29 +144,11 @@ class TestContextManagerAutoSync:
         assert files_removed == 4  # All Python files removed
 
         # Verify only markdown files remain
-        files = manager.get_file_paths(relative=True)
-        # Normalize paths for cross-platform compatibility
-        normalized_files = [f.replace("\\", "/") for f in files]
-        assert "README.md" in normalized_files
-        assert "src/main.py" not in normalized_files
+        files = relative_files(manager)
+        assert "README.md" in files
+        assert "src/main.py" not in files
         assert len(files) == 1  # Only README.md
 
-    def test_multiple_patterns_no_duplicate_files(
-        self, manager: ContextManager, temp_dir: Path
-    ) -> None:
-        """Test that overlapping patterns don't create duplicate files."""
-        self.create_test_files(temp_dir)
-
-        # Watch overlapping patterns
-        manager.watch_paths(["src/**/*.py"])
-        first_count = len(manager.files)
-
-        manager.watch_paths(["src/*.py"])  # Overlaps with previous
-        second_count = len(manager.files)
-
-        # No new files should be added (src/*.py is subset of src/**/*.py)
-        assert first_count == second_count
-
     def test_refresh_files_syncs_with_patterns(
         self, manager: ContextManager, temp_dir: Path
     ) -> None:
@@ -148,11 +185,8 @@ class TestContextManagerAutoSync:
         # Sync should pick up the new file
         added = manager.refresh_files()
         assert added == initial_count + 1  # All files re-added plus new one
-        # Normalize paths for cross-platform compatibility
-        normalized_files = [
-            f.replace("\\", "/") for f in manager.get_file_paths(relative=True)
-        ]
-        assert "NEW.md" in normalized_files
+        files = relative_files(manager)
+        assert "NEW.md" in files
 
     def test_ignore_patterns_respected_in_auto_sync(
         self, manager: ContextManager, temp_dir: Path
@@ -167,34 +201,11 @@ class TestContextManagerAutoSync:
         patterns_added, files_added = manager.watch_paths(["**/*.py"])
 
         # Verify test files are not included
-        files = manager.get_file_paths(relative=True)
-        # Normalize paths for cross-platform compatibility
-        normalized_files = [f.replace("\\", "/") for f in files]
-        assert "tests/test_main.py" not in normalized_files
-        assert "src/main.py" in normalized_files
+        files = relative_files(manager)
+        assert "tests/test_main.py" not in files
+        assert "src/main.py" in files
         assert files_added == 5  # setup.py + 4 source files (non-test)
 
-    def test_empty_patterns_behavior(self, manager: ContextManager) -> None:
-        """Test behavior with empty watch patterns."""
-        # No patterns watched
-        assert len(manager.watched_patterns) == 0
-        assert len(manager.files) == 0
-
-        # Refresh should keep empty
-        added = manager.refresh_files()
-        assert added == 0
-        assert len(manager.files) == 0
-
-    def test_invalid_patterns_ignored(
-        self, manager: ContextManager, temp_dir: Path
-    ) -> None:
-        """Test that invalid patterns are handled gracefully."""
-        # Try to watch non-existent path
-        patterns_added, files_added = manager.watch_paths(["/nonexistent/path/*.py"])
-
-        assert patterns_added == 1  # Pattern is added
-        assert files_added == 0  # But no files match
-
     def test_remove_pattern_with_shared_files(
         self, manager: ContextManager, temp_dir: Path
     ) -> None:
@@ -203,22 +214,16 @@ class TestContextManagerAutoSync:
 
         # Watch overlapping patterns
         manager.watch_paths(["src/**/*.py", "src/main.py"])
-        # Normalize paths for cross-platform compatibility
-        normalized_files = [
-            f.replace("\\", "/") for f in manager.get_file_paths(relative=True)
-        ]
-        assert "src/main.py" in normalized_files
+        files = relative_files(manager)
+        assert "src/main.py" in files
 
         # Remove specific pattern
         patterns_removed, files_removed = manager.unwatch_paths(["src/main.py"])
 
         # File should still exist due to other pattern
         assert patterns_removed == 1
-        # Normalize paths for cross-platform compatibility
-        normalized_files = [
-            f.replace("\\", "/") for f in manager.get_file_paths(relative=True)
-        ]
-        assert "src/main.py" in normalized_files
+        files = relative_files(manager)
+        assert "src/main.py" in files
 
     def test_profile_with_auto_sync(
         self, manager: ContextManager, temp_dir: Path
@@ -263,22 +268,16 @@ class TestContextManagerAutoSync:
         # Refresh to pick up changes
         manager.refresh_files()
         assert len(manager.files) == initial_count + 1
-        # Normalize paths for cross-platform compatibility
-        normalized_files = [
-            f.replace("\\", "/") for f in manager.get_file_paths(relative=True)
-        ]
-        assert "changelog.md" in normalized_files
+        files = relative_files(manager)
+        assert "changelog.md" in files
 
         # Delete a file
         (temp_dir / "README.md").unlink()
 
         # Refresh should remove deleted file
         manager.refresh_files()
-        # Normalize paths for cross-platform compatibility
-        normalized_files = [
-            f.replace("\\", "/") for f in manager.get_file_paths(relative=True)
-        ]
-        assert "README.md" not in normalized_files
+        files = relative_files(manager)
+        assert "README.md" not in files
 
     def test_state_persistence_with_auto_sync(
         self, manager: ContextManager, temp_dir: Path
@@ -292,18 +291,21 @@ class TestContextManagerAutoSync:
         original_patterns = set(manager.watched_patterns)
 
         # Create new manager instance (simulates restart)
-        new_manager = ContextManager(storage=JsonStorage(temp_dir / ".contextr"))
+        new_manager = ContextManager(
+            storage=JsonStorage(temp_dir / ".contextr"), base_dir=temp_dir
+        )
 
         # Verify state was persisted
         assert set(new_manager.watched_patterns) == original_patterns
         assert set(new_manager.get_file_paths(relative=True)) == original_files
 
-    def test_no_manual_file_operations(self, manager: ContextManager) -> None:
+    def test_no_manual_file_operations(self) -> None:
         """Test that manual file operations are not available."""
+        # Methods live on the class, so no instance (or directory) is needed
         # These methods should be private
-        assert not hasattr(manager, "add_files")
-        assert not hasattr(manager, "remove_files")
+        assert not hasattr(ContextManager, "add_files")
+        assert not hasattr(ContextManager, "remove_files")
 
         # Only these should be public
-        assert hasattr(manager, "_add_files")
-        assert hasattr(manager, "_remove_files")
+        assert hasattr(ContextManager, "_add_files")
+        assert hasattr(ContextManager, "_remove_files")
@@ -93,6 +93,48 @@ class TestContextManagerStorage:
         assert sorted(saved_data["files"]) == ["file1.py", "file2.py"]
         assert saved_data["watched_patterns"] == ["*.py"]
 
+    def test_unchanged_state_is_not_rewritten(
+        self, manager_with_mock_storage: ContextManager, mock_storage: MockStorage
+    ) -> None:
+        """Saving the same state twice writes it once."""
+        manager = manager_with_mock_storage
+        manager.files = {"/test/dir/file1.py"}
+
+        manager._save_state()
+        manager._save_state()
+
+        assert mock_storage.save_called == 1
+
+    def test_clearing_empty_context_writes_nothing(
+        self, manager_with_mock_storage: ContextManager, mock_storage: MockStorage
+    ) -> None:
+        """A second clear() finds nothing to change and skips the write."""
+        manager = manager_with_mock_storage
+        manager.files = {"/test/dir/file1.py"}
+
+        manager.clear()
+        manager.clear()
+
+        assert mock_storage.save_called == 1
+        assert mock_storage.data["state"]["files"] == []
+
+    def test_batched_saves_write_once(
+        self, manager_with_mock_storage: ContextManager, mock_storage: MockStorage
+    ) -> None:
+        """Mutations inside batched_saves() are persisted on exit, once."""
+        manager = manager_with_mock_storage
+
+        with manager.batched_saves():
+            with manager.batched_saves():
+                manager.files.add("/test/dir/a.py")
+                manager._save_state()
+            manager.files.add("/test/dir/b.py")
+            manager._save_state()
+            assert mock_storage.save_called == 0
+
+        assert mock_storage.save_called == 1
+        assert mock_storage.data["state"]["files"] == ["a.py", "b.py"]
+
     def test_add_files_saves_state(
         self, manager_with_mock_storage: ContextManager, mock_storage: MockStorage
     ) -> None:
@@ -101,7 +143,7 @@ class TestContextManagerStorage:
 
         with patch("contextr.manager.normalize_paths") as mock_normalize:
             mock_normalize.return_value = ["/test/dir/new_file.py"]
-            with patch("pathlib.Path.is_file", return_value=True):
+            with patch("contextr.manager.os.path.isfile", return_value=True):
                 manager._add_files(["new_file.py"])
 
         assert mock_storage.save_called >= 1
@@ -354,3 +396,42 @@ class TestContextManagerStorage:
 
         # Should be identical
         assert first_patterns == second_patterns
+
+    def test_relative_path_cache_resets_with_base_dir(
+        self, manager_with_mock_storage: ContextManager
+    ) -> None:
+        """Test relative paths are memoized and recomputed when base_dir changes."""
+        manager = manager_with_mock_storage
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            temp_path = Path(tmpdir).resolve()
+            (temp_path / "pkg").mkdir()
+            target = str(temp_path / "pkg" / "mod.py")
+
+            manager.base_dir = temp_path
+            first = manager.relative_path(target)
+            assert first == str(Path("pkg") / "mod.py")
+            with patch("contextr.manager.make_relative") as mock_relative:
+                assert manager.relative_path(target) == first
+                mock_relative.assert_not_called()
+
+            manager.base_dir = temp_path / "pkg"
+            assert manager.relative_path(target) == "mod.py"
+
+    def test_loaded_paths_save_without_recomputing(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test stored relative paths are loaded and saved again without resolving."""
+        monkeypatch.chdir(tmp_path.resolve())
+        storage = MockStorage()
+        rel = str(Path("src") / "a.py")
+        storage.data["state"] = {"files": [rel], "watched_patterns": []}
+
+        with patch("contextr.manager.make_absolute") as mock_absolute:
+            manager = ContextManager(storage=storage)
+            mock_absolute.assert_not_called()
+        assert manager.files == {str(tmp_path.resolve() / "src" / "a.py")}
+        with patch("contextr.manager.make_relative") as mock_relative:
+            manager._save_state()  # type: ignore[reportPrivateUsage]
+            mock_relative.assert_not_called()
+        assert storage.data["state"]["files"] == [rel]
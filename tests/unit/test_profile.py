@@ -14,7 +14,12 @@ from contextr.storage import StorageBackend
 @pytest.fixture
 def mock_storage() -> Mock:
     """Create a mock storage backend."""
-    return Mock(spec=StorageBackend)
+    storage = Mock(spec=StorageBackend)
+    # Route bulk loads through the default list_keys + load implementation
+    storage.load_prefix.side_effect = lambda prefix="": StorageBackend.load_prefix(
+        storage, prefix
+    )
+    return storage
 
 
 @pytest.fixture
@@ -150,6 +150,31 @@ class TestJsonStorage:
         configs = storage.list_keys("configs/")
         assert configs == ["configs/config1"]
 
+    def test_load_prefix_nested(self, storage: JsonStorage) -> None:
+        """Test bulk loading all entries under a nested prefix."""
+        storage.save("profiles/b", {"name": "b"})
+        storage.save("profiles/a", {"name": "a"})
+        storage.save("states/s", {"name": "s"})
+
+        loaded = storage.load_prefix("profiles/")
+        assert list(loaded) == ["profiles/a", "profiles/b"]
+        assert loaded["profiles/a"] == {"name": "a"}
+        assert storage.load_prefix("missing/") == {}
+        assert storage.load_prefix("profiles/a") == {"profiles/a": {"name": "a"}}
+
+    def test_load_prefix_matches_list_keys(
+        self, storage: JsonStorage, temp_dir: Path
+    ) -> None:
+        """Test bulk loading sees the same keys as list_keys, dotfiles included."""
+        storage.save("profiles/a", {"name": "a"})
+        storage.save("top", {"name": "top"})
+        (temp_dir / "profiles" / ".hidden.json").write_text('{"name": "h"}')
+        (temp_dir / ".hidden.json").write_text('{"name": "h"}')
+
+        for prefix in ("", "profiles/"):
+            assert list(storage.load_prefix(prefix)) == storage.list_keys(prefix)
+        assert storage.list_keys("profiles/") == ["profiles/a"]
+
     def test_save_overwrites_existing(self, storage: JsonStorage) -> None:
         """Test that save overwrites existing data."""
         key = "overwrite_test"
@@ -179,6 +204,15 @@ class TestJsonStorage:
         parsed = json.loads(content)
         assert list(parsed.keys()) == sorted(parsed.keys())  # Keys are sorted
 
+    def test_state_saved_compact(self, storage: JsonStorage, temp_dir: Path) -> None:
+        """Test that the frequently rewritten state file is written compact."""
+        data = {"watched_patterns": ["src/**"], "files": ["a.py"]}
+
+        storage.save("state", data)
+
+        content = (temp_dir / "state.json").read_text(encoding="utf-8")
+        assert content == json.dumps(data, sort_keys=True, separators=(",", ":"))
+
     def test_error_handling_save(self, temp_dir: Path, monkeypatch) -> None:
         """Test error handling when save fails."""
         storage = JsonStorage(temp_dir)
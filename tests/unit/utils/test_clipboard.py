@@ -0,0 +1,55 @@
+"""Unit tests for clipboard module."""
+
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from contextr.utils import clipboard
+
+
+@pytest.fixture(autouse=True)
+def fresh_detection() -> Iterator[None]:
+    clipboard.clipboard_command.cache_clear()
+    yield
+    clipboard.clipboard_command.cache_clear()
+
+
+def test_prefers_wl_copy_under_wayland(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(clipboard.sys, "platform", "linux")
+    monkeypatch.setenv("WAYLAND_DISPLAY", "wayland-0")
+    monkeypatch.setenv("DISPLAY", ":0")
+    monkeypatch.setattr(clipboard.shutil, "which", lambda name: f"/usr/bin/{name}")
+    assert clipboard.clipboard_command() == ["wl-copy"]
+
+
+def test_falls_back_to_xsel_on_x11(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(clipboard.sys, "platform", "linux")
+    monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+    monkeypatch.setenv("DISPLAY", ":0")
+    monkeypatch.setattr(
+        clipboard.shutil,
+        "which",
+        lambda name: "/usr/bin/xsel" if name == "xsel" else None,
+    )
+    assert clipboard.clipboard_command() == ["xsel", "--clipboard", "--input"]
+
+
+def test_copy_pipes_utf8_to_command_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(clipboard, "clipboard_command", lambda: ["xclip"])
+    with patch.object(clipboard.subprocess, "run") as mock_run:
+        clipboard.copy_to_clipboard("héllo")
+    mock_run.assert_called_once()
+    args, kwargs = mock_run.call_args
+    assert args == (["xclip"],)
+    assert kwargs["input"] == "héllo".encode("utf-8")
+    assert kwargs["check"] is True
+
+
+def test_copy_uses_pyperclip_without_command(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(clipboard.sys, "platform", "win32")
+    with patch("pyperclip.copy") as mock_copy:
+        clipboard.copy_to_clipboard("text")
+    mock_copy.assert_called_once_with("text")
@@ -0,0 +1,85 @@
+"""Unit tests for dir_cache module."""
+
+import os
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from contextr.utils.dir_cache import CachedDirEntry, DirListingCache
+
+OLD_NS = 1_000_000_000_000_000_000  # 2001-09-09, well outside the racy window
+
+
+def _age(path: Path) -> None:
+    os.utime(path, ns=(OLD_NS, OLD_NS))
+
+
+class TestDirListingCache:
+    """Test cases for DirListingCache."""
+
+    def test_unchanged_directory_is_not_rescanned(
+        self, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        """Test that a persisted listing is reused while the mtime is unchanged."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.py").touch()
+        (tmp_path / "src" / "pkg").mkdir()
+        _age(tmp_path / "src")
+        (tmp_path / ".contextr").mkdir()
+        cache_file = tmp_path / ".contextr" / "cache" / "dirs.json"
+
+        first = DirListingCache(cache_file)
+        first.list_dir(str(tmp_path / "src"))
+        first.save()
+        assert cache_file.exists()
+        assert (cache_file.parent / ".gitignore").read_text() == "*\n"
+
+        spy = mocker.spy(os, "scandir")
+        second = DirListingCache(cache_file)
+        entries = {e.name: e for e in second.list_dir(str(tmp_path / "src"))}
+        assert spy.call_count == 0
+        assert entries["a.py"].is_file() and not entries["a.py"].is_dir()
+        assert entries["pkg"].is_dir(follow_symlinks=False)
+        assert entries["a.py"].path == str(tmp_path / "src" / "a.py")
+
+    def test_symlink_targets_are_not_cached(self, tmp_path: Path) -> None:
+        """Test that a linked dir replaced by a file is seen under a cached parent."""
+        (tmp_path / "target").mkdir()
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "link").symlink_to(tmp_path / "target")
+        _age(tmp_path / "src")
+        (tmp_path / ".contextr").mkdir()
+        cache_file = tmp_path / ".contextr" / "cache" / "dirs.json"
+
+        first = DirListingCache(cache_file)
+        (link,) = first.list_dir(str(tmp_path / "src"))
+        assert link.is_dir() and not link.is_dir(follow_symlinks=False)
+        first.save()
+
+        (tmp_path / "target").rmdir()
+        (tmp_path / "target").touch()
+        second = DirListingCache(cache_file)
+        (link,) = second.list_dir(str(tmp_path / "src"))
+        assert isinstance(link, CachedDirEntry)
+        assert link.is_file() and not link.is_dir()
+        assert not link.is_file(follow_symlinks=False)
+
+    def test_changed_directory_is_rescanned(self, tmp_path: Path) -> None:
+        """Test that adding an entry (which bumps the mtime) invalidates it."""
+        _age(tmp_path)
+        (tmp_path / ".contextr").mkdir()
+        _age(tmp_path)
+        cache = DirListingCache(tmp_path / ".contextr" / "cache" / "dirs.json")
+        assert [e.name for e in cache.list_dir(str(tmp_path))] == [".contextr"]
+
+        (tmp_path / "new.py").touch()
+        names = {e.name for e in cache.list_dir(str(tmp_path))}
+        assert names == {".contextr", "new.py"}
+
+    def test_save_skipped_without_state_dir(self, tmp_path: Path) -> None:
+        """Test that nothing is written before the .contextr directory exists."""
+        cache_file = tmp_path / ".contextr" / "cache" / "dirs.json"
+        cache = DirListingCache(cache_file)
+        cache.list_dir(str(tmp_path))
+        cache.save()
+        assert not (tmp_path / ".contextr").exists()
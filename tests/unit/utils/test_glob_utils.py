@@ -0,0 +1,84 @@
+"""Unit tests for glob_utils module."""
+
+import glob
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from contextr.utils.glob_utils import expand_glob, split_pattern
+
+
+def _make_tree(root: Path) -> None:
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "main.py").write_text("main")
+    (root / "src" / "pkg" / "mod.py").write_text("mod")
+    (root / "src" / "pkg" / "data.txt").write_text("data")
+    (root / "src" / ".hidden.py").write_text("hidden")
+    (root / "src" / ".cache").mkdir()
+    (root / "src" / ".cache" / "x.py").write_text("x")
+
+
+class TestSplitPattern:
+    """Test cases for split_pattern function."""
+
+    def test_literal_prefix_and_tail(self) -> None:
+        """Test that leading literal segments are peeled off."""
+        prefix, tail = split_pattern(os.path.join(os.sep, "a", "b", "**", "*.py"))
+        assert prefix == os.path.join(os.sep, "a", "b")
+        assert tail == ["**", "*.py"]
+
+    def test_fully_literal_pattern(self) -> None:
+        """Test a pattern with no wildcards has an empty tail."""
+        prefix, tail = split_pattern(os.path.join(os.sep, "a", "b.py"))
+        assert prefix == os.path.join(os.sep, "a", "b.py")
+        assert tail == []
+
+
+class TestExpandGlob:
+    """Test cases for expand_glob function."""
+
+    def test_matches_glob_module(self, tmp_path: Path) -> None:
+        """Test results agree with glob.glob(recursive=True)."""
+        _make_tree(tmp_path)
+        for pattern in ["src/**/*.py", "src/*.py", "src/**", "**/mod.py", "src/.*"]:
+            abs_pattern = str(tmp_path / pattern)
+            assert sorted(expand_glob(abs_pattern)) == sorted(
+                glob.glob(abs_pattern, recursive=True)
+            )
+
+    def test_literal_prefix_not_scanned(
+        self, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        """Test that only directories at or below the first wildcard are listed."""
+        _make_tree(tmp_path)
+        spy = mocker.spy(os, "scandir")
+        result = expand_glob(str(tmp_path / "src" / "pkg" / "*.py"))
+        assert result == [str(tmp_path / "src" / "pkg" / "mod.py")]
+        assert spy.call_count == 1
+
+    def test_trailing_separator_matches_directories_only(self, tmp_path: Path) -> None:
+        """Test that a trailing separator restricts matches to directories."""
+        _make_tree(tmp_path)
+        result = expand_glob(str(tmp_path / "src" / "*") + os.sep)
+        assert result == [str(tmp_path / "src" / "pkg")]
+
+    def test_double_star_follows_symlinked_directories(self, tmp_path: Path) -> None:
+        """Test that '**' descends into symlinked directories, once each."""
+        (tmp_path / "shared" / "lib").mkdir(parents=True)
+        (tmp_path / "shared" / "lib" / "u.py").write_text("u")
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "m.py").write_text("m")
+        try:
+            (tmp_path / "app" / "lib").symlink_to(tmp_path / "shared" / "lib")
+            # A cycle back to an ancestor must not be walked forever
+            (tmp_path / "shared" / "lib" / "up").symlink_to(tmp_path / "app")
+        except OSError:
+            pytest.skip("Symlinks not supported on this system")
+
+        result = expand_glob(str(tmp_path / "app" / "**" / "*.py"))
+        assert sorted(result) == [
+            str(tmp_path / "app" / "lib" / "u.py"),
+            str(tmp_path / "app" / "m.py"),
+        ]
@@ -66,3 +66,112 @@ def test_bare_dir_name_matches_descendants(tmp_path: Path) -> None:
     # Re-include a subfolder
     im.add_pattern("!node_modules/keep/")
     assert im.should_ignore(str(keep_x)) is False
+
+
+def test_compiled_patterns_are_reused(tmp_path: Path) -> None:
+    """Re-adding a known pattern reuses the cached regex instead of recompiling."""
+    im = IgnoreManager(tmp_path)
+    im.clear_patterns()
+    im.add_pattern("*.log")
+    first = im._rules[0].regex  # type: ignore[reportPrivateUsage]
+
+    other = IgnoreManager(tmp_path)
+    assert other._rules[0].regex is first  # type: ignore[reportPrivateUsage]
+    assert other.should_ignore(str(tmp_path / "a" / "debug.log")) is True
+    assert other.should_ignore(str(tmp_path / "a" / "debug.txt")) is False
+
+
+def test_is_redundant_for_covered_literal_patterns(tmp_path: Path) -> None:
+    im = IgnoreManager(tmp_path)
+    im.clear_patterns()
+    im.add_pattern("**/*.log")
+    im.add_pattern("/build")
+
+    assert im.is_redundant("foo/bar.log") is True
+    assert im.is_redundant("/foo/bar.log") is True
+    assert im.is_redundant("/build/out.txt") is True
+    # Unanchored would also match sub/build, which /build does not cover
+    assert im.is_redundant("build") is False
+    assert im.is_redundant("foo/bar.txt") is False
+    assert im.is_redundant("*.log") is False  # wildcards are not analysed
+
+    # A negation could be overridden by a new rule, so nothing is redundant
+    im.add_pattern("!keep.log")
+    assert im.is_redundant("foo/bar.log") is False
+
+
+def test_paths_below_base_are_not_resolved(tmp_path: Path, monkeypatch) -> None:
+    im = IgnoreManager(tmp_path)
+    im.clear_patterns()
+    im.add_pattern("build/")
+    assert im.should_ignore_relative("build/out.txt") is True
+    assert im.should_ignore_relative("src/build.py") is False
+
+    def fail(self: Path, strict: bool = False) -> Path:
+        raise AssertionError("walked paths should not be resolved")
+
+    monkeypatch.setattr(Path, "resolve", fail)
+    assert im.should_ignore(str(tmp_path / "build" / "out.txt")) is True
+    assert im.should_ignore(str(tmp_path / "src" / "main.py")) is False
+
+
+def test_literal_rules_match_like_their_regexes(tmp_path: Path) -> None:
+    im = IgnoreManager(tmp_path)
+    im.clear_patterns()
+    for p in ["__pycache__/", "*.pyc", "docs/*.md", "/dist"]:
+        im.add_pattern(p)
+    assert im._combined is not None  # type: ignore[reportPrivateUsage]
+
+    cases = [
+        "__pycache__",
+        "pkg/__pycache__/mod.py",
+        "pkg/__pycache___/mod.py",
+        "mod.pyc",
+        "pkg/mod.pyc",
+        "pkg/mod.pyc.txt",
+        "pkg/mod.py",
+        "docs/readme.md",
+        "src/docs/readme.md",
+        "dist/app.js",
+        "src/dist/app.js",
+    ]
+    rules = im._rules  # type: ignore[reportPrivateUsage]
+    for rel in cases:
+        expected = any(r.regex and r.regex.search(rel) for r in rules)
+        assert im.should_ignore_relative(rel) is bool(expected), rel
+
+    # With a negation present every rule goes through ordered evaluation
+    im.add_pattern("!keep.pyc")
+    assert im.should_ignore_relative("pkg/mod.pyc") is True
+    assert im.should_ignore_relative("pkg/keep.pyc") is False
+
+
+def test_load_patterns_handles_comments_and_crlf(tmp_path: Path) -> None:
+    ignore_file = tmp_path / ".contextr" / ".ignore"
+    ignore_file.parent.mkdir()
+    ignore_file.write_bytes(b"# deps\r\nnode_modules/\r\n\r\n!keep.log\r\n*.log")
+
+    im = IgnoreManager(tmp_path)
+    assert im.list_patterns() == ["node_modules/", "!keep.log", "*.log"]
+
+    im.save_patterns()
+    assert (
+        ignore_file.read_text(encoding="utf-8") == "node_modules/\n!keep.log\n*.log\n"
+    )
+
+
+def test_add_patterns_compiles_and_saves_once(tmp_path: Path, monkeypatch) -> None:
+    im = IgnoreManager(tmp_path)
+    im.clear_patterns()
+    im.add_pattern("*.log")
+    saves: list[int] = []
+    monkeypatch.setattr(im, "save_patterns", lambda: saves.append(1))
+
+    im.add_patterns(["dist/", " ", "*.log", "!keep.log", "dist/"])
+    assert im.list_patterns() == ["*.log", "dist/", "!keep.log"]
+    assert saves == [1]
+    assert im.should_ignore_relative("dist/app.js") is True
+    assert im.should_ignore_relative("keep.log") is False
+
+    im.add_patterns(["dist/"])  # nothing new: .ignore is left alone
+    assert saves == [1]
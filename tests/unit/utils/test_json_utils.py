@@ -0,0 +1,39 @@
+"""Unit tests for json_utils module."""
+
+import pytest
+
+from contextr.utils import json_utils
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_with_and_without_orjson(
+    use_orjson: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Both decoders return the same value and raise JSONDecodeError."""
+    if not use_orjson:
+        monkeypatch.setattr(json_utils, "orjson", None)
+    elif json_utils.orjson is None:
+        pytest.skip("orjson not installed")
+
+    assert json_utils.loads(b'{"files": ["a.py"], "n": 1}') == {
+        "files": ["a.py"],
+        "n": 1,
+    }
+    with pytest.raises(json_utils.JSONDecodeError):
+        json_utils.loads(b"{invalid json}")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_with_and_without_orjson(
+    use_orjson: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Both encoders write the same compact, key-sorted UTF-8 document."""
+    if not use_orjson:
+        monkeypatch.setattr(json_utils, "orjson", None)
+    elif json_utils.orjson is None:
+        pytest.skip("orjson not installed")
+
+    data = {"watched_patterns": ["src/**"], "files": ["é.py"], "n": None}
+    assert json_utils.dumps(data) == (
+        '{"files":["é.py"],"n":null,"watched_patterns":["src/**"]}'.encode("utf-8")
+    )
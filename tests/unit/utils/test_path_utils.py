@@ -6,7 +6,13 @@ from pathlib import Path
 import pytest
 from pytest_mock import MockerFixture
 
-from contextr.utils.path_utils import make_absolute, make_relative, normalize_paths
+from contextr.utils.path_utils import (
+    make_absolute,
+    make_relative,
+    normalize_paths,
+    scandir_recursive,
+    strip_base_prefix,
+)
 
 
 class TestMakeRelative:
@@ -50,6 +56,23 @@ class TestMakeRelative:
         assert result == expected
 
 
+class TestStripBasePrefix:
+    """Test cases for strip_base_prefix function."""
+
+    def test_path_below_base(self, tmp_path: Path) -> None:
+        """Test a normalized path below the base is sliced."""
+        prefix = os.path.join(str(tmp_path), "")
+        path = str(tmp_path / "src" / "main.py")
+        assert strip_base_prefix(path, prefix) == os.path.join("src", "main.py")
+
+    def test_falls_back_for_other_paths(self, tmp_path: Path) -> None:
+        """Test sibling prefixes and unnormalized paths are not sliced."""
+        prefix = os.path.join(str(tmp_path / "repo"), "")
+        assert strip_base_prefix(str(tmp_path / "repo2" / "a.py"), prefix) is None
+        dotted = os.path.join(str(tmp_path / "repo"), "..", "a.py")
+        assert strip_base_prefix(dotted, prefix) is None
+
+
 class TestMakeAbsolute:
     """Test cases for make_absolute function."""
 
@@ -185,8 +208,8 @@ class TestNormalizePaths:
         self, tmp_path: Path, mocker: MockerFixture
     ) -> None:
         """Test error handling for glob pattern processing."""
-        # Mock glob.glob to raise an exception (normalize_paths uses glob.glob)
-        mock_glob = mocker.patch("contextr.utils.path_utils.glob.glob")
+        # Mock expand_glob to raise an exception (normalize_paths uses it)
+        mock_glob = mocker.patch("contextr.utils.path_utils.expand_glob")
         mock_glob.side_effect = Exception("Glob error")
 
         patterns = ["*.py"]
@@ -207,3 +230,40 @@ class TestNormalizePaths:
         # Should resolve relative path from base_dir
         expected = str((base_dir / "relative/path/file.txt").resolve())
         assert result == expected
+
+
+class TestScandirRecursive:
+    """Test cases for scandir_recursive function."""
+
+    def test_yields_nested_files_only(self, tmp_path: Path) -> None:
+        """Test that files at every depth are yielded and directories are not."""
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "top.py").touch()
+        (tmp_path / "a" / "mid.py").touch()
+        (tmp_path / "a" / "b" / "deep.py").touch()
+
+        result = {entry.path for entry in scandir_recursive(str(tmp_path))}
+
+        assert result == {
+            str(tmp_path / "top.py"),
+            str(tmp_path / "a" / "mid.py"),
+            str(tmp_path / "a" / "b" / "deep.py"),
+        }
+
+    def test_missing_root_yields_nothing(self, tmp_path: Path) -> None:
+        """Test that a non-existent root is skipped without raising."""
+        assert list(scandir_recursive(str(tmp_path / "missing"))) == []
+
+    def test_directory_symlinks_not_followed(self, tmp_path: Path) -> None:
+        """Test that symlinked directories are not descended into."""
+        real = tmp_path / "real"
+        real.mkdir()
+        (real / "file.txt").touch()
+        try:
+            (tmp_path / "loop").symlink_to(tmp_path)
+        except OSError:
+            pytest.skip("Symlinks not supported on this system")
+
+        result = [entry.path for entry in scandir_recursive(str(tmp_path))]
+
+        assert result == [str(real / "file.txt")]